@@ -1,8 +1,8 @@
 import asyncio
 import os
-import base58
 from utils.config_loader import ConfigLoader
 from utils.logger import BotLogger
+from utils.http_session import close_shared_session
 from services.dexscreener import DexScreener
 from services.solana_sniffer import SolanaSniffer
 from services.jupiter import Jupiter
@@ -16,6 +16,8 @@ class TradingBot:
     Hauptlogik des Trading-Bots.
     """
 
+    PRECHECK_SAFETY_MARGIN = 5.0  # Sekunden Puffer vor Ende des Zyklus
+
     def __init__(self):
         # Initialisierung der Konfigurations- und Logging-Systeme
         self.config = ConfigLoader()
@@ -29,27 +31,37 @@ class TradingBot:
         # Laden der Module mit korrekten Parametern
         self.dexscreener = DexScreener(self.logger, self.config.get("dexscreener.filters"))
         self.sniffer = SolanaSniffer(self.logger)
-        self.jupiter = Jupiter(self.logger)
+        # Preise höchstens ein Viertel eines Zyklus (max. 5s) zwischenspeichern
+        self.cycle_interval = float(self.config.get("trading.cycle_interval", 60))
+        self.jupiter = Jupiter(self.logger, price_cache_ttl=min(self.cycle_interval / 4, 5.0))
         self.wallet = PhantomWallet(wallet_private_key)  # Fix: Sicherer Private Key-Check
+        self.wallet_public_key = str(self.wallet.public_key)
         self.position_manager = PositionManager(self.logger)
         self.risk_manager = RiskManager(self.logger, self.config.get("trading"))
         self.sentiment_analyzer = SentimentAnalyzer(self.logger)  # Fix: Korrekte Initialisierung
 
+        # Begrenzt parallele Vorabprüfungen, um die Rate Limits der APIs einzuhalten
+        self.precheck_semaphore = asyncio.Semaphore(16)
+
     async def run(self):
         """
         Startet den Trading-Bot.
         """
         self.logger.info("🚀 Trading-Bot gestartet!")
-        await self.wallet.connect()
+        if not await self.wallet.connect():
+            self.logger.error("❌ Keine Verbindung zum Solana-Netzwerk, Bot wird beendet.")
+            await self.wallet.disconnect()
+            return
+        self.wallet.start_blockhash_updater()
 
         try:
             while True:
                 await self.execute_trading_cycle()
-                await asyncio.sleep(self.config.get("trading.cycle_interval", 60))
+                await asyncio.sleep(self.cycle_interval)
         except KeyboardInterrupt:
             self.logger.info("❌ Bot gestoppt.")
         finally:
-            await self.wallet.disconnect()
+            await asyncio.gather(self.wallet.disconnect(), close_shared_session(), return_exceptions=True)
 
     async def execute_trading_cycle(self):
         """
@@ -58,17 +70,30 @@ class TradingBot:
         self.logger.info("🔄 Neuer Trading-Zyklus gestartet...")
         opportunities = await self.dexscreener.get_filtered_tokens("solana")  # Fix: Methode korrigiert
 
-        for opportunity in opportunities:
+        # Sicherheits- und Sentiment-Checks aller Opportunities laufen parallel und
+        # werden abgebrochen, wenn sie nicht vor Ende des Zyklus fertig sind
+        deadline = asyncio.get_running_loop().time() + max(self.cycle_interval - self.PRECHECK_SAFETY_MARGIN, 1.0)
+        async with asyncio.TaskGroup() as task_group:
+            precheck_tasks = [
+                task_group.create_task(self.run_prechecks(opportunity, deadline))
+                for opportunity in opportunities
+            ]
+
+        for opportunity, precheck_task in zip(opportunities, precheck_tasks):
             token_address = opportunity["address"]
             current_price = opportunity["price_usd"]
 
+            precheck = precheck_task.result()
+            if precheck is None:
+                continue
+            contract_analysis, sentiment_data = precheck
+
             # Sicherheitschecks
-            if not await self.sniffer.check_contract(token_address):  # Fix: Methode korrigiert
+            if not contract_analysis:
                 self.logger.warning(f"⚠ Token nicht sicher: {token_address}")
                 continue
 
             # Sentiment-Check
-            sentiment_data = await self.sentiment_analyzer.get_token_sentiment(opportunity["symbol"])  # Fix: Methode korrigiert
             if not self.sentiment_analyzer.is_bullish_sentiment(sentiment_data):
                 self.logger.info(f"📉 Sentiment nicht bullish: {opportunity['symbol']}")
                 continue
@@ -79,9 +104,9 @@ class TradingBot:
                 continue
 
             # Position eröffnen
-            position_size = self.risk_manager.calculate_position_size(
-                current_price, self.risk_manager.get_stop_loss(current_price)
-            )
+            stop_loss = self.risk_manager.get_stop_loss(current_price)
+            take_profit = self.risk_manager.get_take_profit(current_price)
+            position_size = self.risk_manager.calculate_position_size(current_price, stop_loss)
             if not position_size:
                 self.logger.warning(f"⚠ Positionsgröße zu klein für {opportunity['symbol']}")
                 continue
@@ -92,38 +117,70 @@ class TradingBot:
                 self.logger.error(f"❌ Keine Route gefunden für {opportunity['symbol']}")
                 continue
                 
-            swap_tx = await self.jupiter.execute_trade(route, base58.b58encode(self.wallet.keypair.to_bytes()).decode("utf-8"))
+            swap_tx = await self.jupiter.execute_trade(route, self.wallet_public_key)
 
             if not swap_tx:
                 self.logger.error(f"❌ Trade fehlgeschlagen für {opportunity['symbol']}")
                 continue
 
             # Position speichern
-            stop_loss = self.risk_manager.get_stop_loss(current_price)
-            take_profit = self.risk_manager.get_take_profit(current_price)
             self.position_manager.open_position(token_address, current_price, position_size, stop_loss, take_profit)
             self.logger.info(f"✅ Trade ausgeführt: {opportunity['symbol']} | Größe: {position_size}")
 
         # Positionen prüfen und schließen
         await self.manage_positions()
 
+    async def run_prechecks(self, opportunity, deadline: float):
+        """
+        Führt Sicherheits- und Sentiment-Check einer Opportunity gleichzeitig aus.
+
+        Args:
+            opportunity: Trading-Opportunity
+            deadline: Event-Loop-Zeitpunkt, an dem ausstehende Checks abgebrochen werden
+
+        Returns:
+            Tuple aus Kontrakt-Analyse und Sentiment-Daten oder None bei Fehler/Timeout
+        """
+        try:
+            async with asyncio.timeout_at(deadline):
+                async with self.precheck_semaphore:
+                    return await asyncio.gather(
+                        self.sniffer.check_contract(opportunity["address"]),
+                        self.sentiment_analyzer.get_token_sentiment(opportunity["symbol"])
+                    )
+        except TimeoutError:
+            self.logger.warning(f"⏱ Vorabprüfung abgebrochen (Zyklusende) für {opportunity['address']}")
+        except Exception as e:
+            self.logger.error(f"❌ Vorabprüfung fehlgeschlagen für {opportunity['address']}: {str(e)}")
+        return None
+
     async def manage_positions(self):
         """
         Überwacht und verwaltet offene Positionen.
         """
         positions = self.position_manager.get_active_positions()
-        for position in positions:
-            token_address = position["token_address"]
-            current_price = await self.jupiter.get_token_price(token_address)
+        prices = await self.jupiter.get_token_prices([position["token"] for position in positions])
 
-            if not current_price:
-                self.logger.warning(f"⚠ Preisabfrage fehlgeschlagen für {token_address}")
-                continue
+        # Alle Schließungen des Zyklus werden gemeinsam und ohne Blockieren des Event-Loops gespeichert
+        async with self.position_manager.buffered_async():
+            # Jeder Token einmal, verglichen nur mit seinen eigenen Positionen
+            for token_address in dict.fromkeys(position["token"] for position in positions):
+                current_price = prices.get(token_address)
 
-            exits = self.position_manager.check_position_exits(current_price)
-            for exit_id in exits:
-                self.position_manager.close_position(exit_id, current_price)
+                if not current_price:
+                    self.logger.warning(f"⚠ Preisabfrage fehlgeschlagen für {token_address}")
+                    continue
+
+                exits = self.position_manager.check_position_exits(current_price, token_address)
+                for exit_id in exits:
+                    self.position_manager.close_position(exit_id, current_price)
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # Optional: libuv-basierter Event-Loop, falls installiert
+        uvloop.install()
+    except ImportError:
+        pass
+
     bot = TradingBot()
     asyncio.run(bot.run())
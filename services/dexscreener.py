@@ -1,6 +1,12 @@
-import aiohttp
-from typing import List, Dict, Any
+import asyncio
+import os
+import time
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
+from yarl import URL
 from utils.logger import BotLogger
+from utils.helpers import Helpers
+from utils.http_session import get_shared_session, request_with_retry
 
 class DexScreener:
     """
@@ -8,10 +14,23 @@ class DexScreener:
     Documentation: https://docs.dexscreener.com/api/
     """
 
-    def __init__(self, logger: BotLogger, filters: Dict[str, Any]):
+    MAX_CONCURRENT_REQUESTS = 64  # Stay well below DexScreener's rate limit
+    TOKEN_METADATA_TTL = 24 * 60 * 60  # Symbol, Name, DEX und URL eines Tokens ändern sich nicht
+
+    def __init__(self, logger: BotLogger, filters: Dict[str, Any], token_cache_file: str = "data/token_metadata.json"):
         self.BASE_URL = "https://api.dexscreener.com/latest/dex"
+        self._base_url = URL(self.BASE_URL)
         self.logger = logger
         self.filters = filters
+        # Per chain: conditional request headers of the last response and its pairs
+        self._pairs_cache: Dict[str, Tuple[Dict[str, str], List[Dict[str, Any]]]] = {}
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self.token_cache_file = token_cache_file
+        self._token_metadata: Optional[Dict[str, Dict[str, Any]]] = None
+        # Schreibvorgänge des Metadaten-Caches laufen nacheinander; neue Änderungen während
+        # eines Schreibvorgangs werden im Anschluss in einem Durchgang übernommen
+        self._token_metadata_lock = asyncio.Lock()
+        self._token_metadata_dirty = False
 
     async def get_filtered_tokens(self, chain: str) -> List[Dict[str, Any]]:
         """
@@ -24,22 +43,42 @@ class DexScreener:
             A list of filtered tokens.
         """
         try:
-            url = f"{self.BASE_URL}/{chain}/pairs"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.logger.info(f"Fetched {len(data['pairs'])} pairs for {chain}.")
-                        return data['pairs']
-                    else:
-                        error_data = await response.text()
-                        self.logger.error(f"DexScreener API Error: {response.status} - {error_data}")
-                        return []
+            url = self._base_url / chain / "pairs"
+            cached = self._pairs_cache.get(chain)
+            headers = cached[0] if cached else None
+            async with request_with_retry(get_shared_session(), "GET", url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    self.logger.info(f"Pairs for {chain} unchanged since last fetch.")
+                    return cached[1]
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    self.logger.info(f"Fetched {len(data['pairs'])} pairs for {chain}.")
+                    self._remember_pairs(chain, response.headers, data['pairs'])
+                    return data['pairs']
+                else:
+                    error_data = await response.text()
+                    self.logger.error(f"DexScreener API Error: {response.status} - {error_data}")
+                    return []
 
         except Exception as e:
             self.logger.error(f"Error fetching filtered tokens: {str(e)}")
             return []
 
+    def _remember_pairs(self, chain: str, response_headers: Any, pairs: List[Dict[str, Any]]) -> None:
+        """
+        Stores the validators of a pairs response so the next fetch can be a conditional request.
+        """
+        validators = {}
+        if "ETag" in response_headers:
+            validators["If-None-Match"] = response_headers["ETag"]
+        if "Last-Modified" in response_headers:
+            validators["If-Modified-Since"] = response_headers["Last-Modified"]
+
+        if validators:
+            self._pairs_cache[chain] = (validators, pairs)
+        else:
+            self._pairs_cache.pop(chain, None)
+
     async def get_token_info(self, token_address: str) -> Dict[str, Any]:
         """
         Fetches information about a specific token.
@@ -51,11 +90,11 @@ class DexScreener:
             A dictionary containing token information.
         """
         try:
-            url = f"{self.BASE_URL}/tokens/{token_address}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
+            url = self._base_url / "tokens" / token_address
+            async with self._request_semaphore:
+                async with request_with_retry(get_shared_session(), "GET", url) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = orjson.loads(await response.read())
                         self.logger.info(f"Fetched info for token: {token_address}.")
                         return data
                     else:
@@ -65,4 +104,101 @@ class DexScreener:
 
         except Exception as e:
             self.logger.error(f"Error fetching token info: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+
+    async def get_token_infos(self, token_addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetches information about several tokens concurrently.
+
+        Args:
+            token_addresses: The addresses of the tokens.
+
+        Returns:
+            A list of token information dictionaries in the order of the given addresses.
+        """
+        return await asyncio.gather(*(self.get_token_info(address) for address in token_addresses))
+
+    async def get_token_metadata(self, token_address: str) -> Dict[str, Any]:
+        """
+        Liefert die statischen Metadaten eines Tokens (Adresse, Name, Symbol, DEX, URL).
+
+        Die Metadaten werden TOKEN_METADATA_TTL Sekunden im Speicher und auf der
+        Festplatte zwischengespeichert, sodass nur die erste Abfrage eines Tokens die
+        API trifft. Marktdaten wie Preis, Volumen und Liquidität liefert get_token_info.
+
+        Args:
+            token_address: Adresse des Tokens
+
+        Returns:
+            Dictionary mit den Metadaten oder leeres Dictionary, falls unbekannt
+        """
+        cache = self._load_token_metadata()
+        cached = cache.get(token_address)
+        if cached and time.time() - cached.get("fetched_at", 0) < self.TOKEN_METADATA_TTL:
+            return cached
+
+        info = await self.get_token_info(token_address)
+        pairs = info.get("pairs") or []
+        if not pairs:
+            return {}
+
+        pair = next((p for p in pairs if p.get("baseToken", {}).get("address") == token_address), pairs[0])
+        base_token = pair.get("baseToken", {})
+        metadata = {
+            "address": token_address,
+            "name": base_token.get("name"),
+            "symbol": base_token.get("symbol"),
+            "dex_id": pair.get("dexId"),
+            "url": pair.get("url"),
+            "fetched_at": time.time()
+        }
+        cache[token_address] = metadata
+        await self._save_token_metadata()
+        return metadata
+
+    def _load_token_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lädt den Metadaten-Cache beim ersten Zugriff von der Festplatte.
+        """
+        if self._token_metadata is None:
+            try:
+                self._token_metadata = Helpers.load_json(self.token_cache_file)
+            except ValueError as e:
+                self.logger.warning(f"Discarding unreadable token metadata cache: {str(e)}")
+                self._token_metadata = {}
+        return self._token_metadata
+
+    async def _save_token_metadata(self) -> None:
+        """
+        Schreibt den Metadaten-Cache in einem Worker-Thread, ohne den Event-Loop zu blockieren.
+
+        Läuft bereits ein Schreibvorgang, wird nur vorgemerkt; der laufende Vorgang
+        schreibt anschließend den neuesten Stand.
+        """
+        self._token_metadata_dirty = True
+        if self._token_metadata_lock.locked():
+            return
+        async with self._token_metadata_lock:
+            while self._token_metadata_dirty:
+                self._token_metadata_dirty = False
+                data = orjson.dumps(self._token_metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                try:
+                    await asyncio.to_thread(self._write_token_metadata, data)
+                except OSError as e:
+                    self.logger.error(f"Error saving token metadata cache: {str(e)}")
+                    return
+
+    def _write_token_metadata(self, data: bytes) -> None:
+        """
+        Schreibt den serialisierten Cache atomar über eine temporäre Datei und os.replace.
+
+        Args:
+            data: JSON-Bytes
+        """
+        directory = os.path.dirname(self.token_cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.token_cache_file}.tmp"
+        with open(tmp_file, "wb") as file:
+            file.write(data)
+        os.replace(tmp_file, self.token_cache_file)
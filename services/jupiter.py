@@ -1,6 +1,25 @@
-import aiohttp
-from typing import Dict, Any, Optional
+import asyncio
+import time
+import orjson
+from typing import Dict, Any, List, Optional, Tuple
+from yarl import URL
 from utils.logger import BotLogger
+from utils.http_session import get_shared_session, request_with_retry
+
+# Feste Swap-Parameter, die bei jeder Anfrage gleich bleiben
+_SWAP_STATIC = {
+    "dynamicComputeUnitLimit": True,  # Optimierte CU Nutzung
+    "dynamicSlippage": {
+        "maxBps": 300  # Max 3% slippage für höhere Erfolgsrate
+    },
+    "prioritizationFeeLamports": {
+        "priorityLevelWithMaxLamports": {
+            "maxLamports": 10000000,
+            "priorityLevel": "veryHigh"
+        }
+    }
+}
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 class Jupiter:
     """
@@ -8,9 +27,121 @@ class Jupiter:
     Dokumentation: https://station.jup.ag/docs/apis/swap-api
     """
 
-    def __init__(self, logger: BotLogger):
+    PRICE_CACHE_MAX_SIZE = 1024
+    PRICE_BATCH_SIZE = 100  # Maximale Anzahl an IDs pro Price-API-Anfrage
+    MAX_CONCURRENT_QUOTES = 20  # Parallele Quote-Anfragen bei Batch-Abfragen
+
+    def __init__(self, logger: BotLogger, price_cache_ttl: float = 5.0):
+        """
+        Initialisiert den Jupiter-Service.
+
+        Args:
+            logger: Logger-Instanz
+            price_cache_ttl: Gültigkeit zwischengespeicherter Preise in Sekunden
+        """
         self.BASE_URL = "https://quote-api.jup.ag/v6"
+        self.PRICE_URL = URL("https://price.jup.ag/v6/price")
+        self.QUOTE_URL = URL(f"{self.BASE_URL}/quote")
+        self.SWAP_URL = URL(f"{self.BASE_URL}/swap")
+        self.SEND_TRANSACTION_URL = URL("https://worker.jup.ag/send-transaction")
         self.logger = logger
+        self.price_cache_ttl = price_cache_ttl
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        # Laufende Preisabfragen, damit gleichzeitige Aufrufer dieselbe Anfrage abwarten
+        self._pending_prices: Dict[str, asyncio.Future] = {}
+        self._pending_routes: Dict[Tuple[str, str, int, int, int], asyncio.Future] = {}
+        self._quote_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_QUOTES)
+
+    async def get_token_price(self, token_address: str) -> Optional[float]:
+        """
+        Holt den aktuellen USD-Preis eines Tokens über die Jupiter Price API.
+        Preise werden für `price_cache_ttl` Sekunden zwischengespeichert.
+        """
+        prices = await self.get_token_prices([token_address])
+        price = prices.get(token_address)
+        if price is None:
+            self.logger.warning(f"Kein Preis gefunden für {token_address}")
+        return price
+
+    async def get_token_prices(self, token_addresses: List[str]) -> Dict[str, float]:
+        """
+        Holt die USD-Preise mehrerer Tokens gebündelt über die Jupiter Price API.
+        Tokens, deren Preis bereits abgefragt wird, warten auf diese Anfrage statt
+        eine eigene zu stellen.
+
+        Args:
+            token_addresses: Token-Adressen (Mints)
+
+        Returns:
+            Dictionary Token-Adresse -> Preis. Tokens ohne Preis fehlen im Ergebnis.
+        """
+        now = time.monotonic()
+        prices: Dict[str, float] = {}
+        missing: List[str] = []
+        for token_address in dict.fromkeys(token_addresses):
+            cached = self._price_cache.get(token_address)
+            if cached and now - cached[0] < self.price_cache_ttl:
+                prices[token_address] = cached[1]
+            else:
+                missing.append(token_address)
+
+        in_flight = {address: self._pending_prices[address] for address in missing if address in self._pending_prices}
+        to_fetch = [address for address in missing if address not in in_flight]
+        loop = asyncio.get_running_loop()
+        futures = {address: loop.create_future() for address in to_fetch}
+        self._pending_prices.update(futures)
+
+        try:
+            batches = [to_fetch[i:i + self.PRICE_BATCH_SIZE] for i in range(0, len(to_fetch), self.PRICE_BATCH_SIZE)]
+            for batch_prices in await asyncio.gather(*(self._fetch_prices(batch) for batch in batches)):
+                for token_address, price in batch_prices.items():
+                    self._cache_price(token_address, price, now)
+                prices.update(batch_prices)
+        finally:
+            for token_address, future in futures.items():
+                del self._pending_prices[token_address]
+                if not future.done():
+                    future.set_result(prices.get(token_address))
+
+        for token_address, future in in_flight.items():
+            price = await asyncio.shield(future)
+            if price is not None:
+                prices[token_address] = price
+        return prices
+
+    async def _fetch_prices(self, token_addresses: List[str]) -> Dict[str, float]:
+        """
+        Fragt die Preise einer Gruppe von Tokens mit einer einzigen Anfrage ab.
+        """
+        try:
+            session = get_shared_session()
+            async with request_with_retry(session, "GET", self.PRICE_URL, params={"ids": ",".join(token_addresses)}) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    return {
+                        token_address: float(price_data["price"])
+                        for token_address, price_data in (data.get("data") or {}).items()
+                        if price_data
+                    }
+                else:
+                    error_data = await response.text()
+                    self.logger.error(f"Jupiter Price API Error: {response.status} - {error_data}")
+                    return {}
+
+        except Exception as e:
+            self.logger.error(f"Fehler beim Abrufen der Preise: {str(e)}")
+            return {}
+
+    def _cache_price(self, token_address: str, price: float, timestamp: float) -> None:
+        """
+        Speichert einen Preis im Cache und verwirft abgelaufene Einträge, sobald er zu groß wird.
+        """
+        if len(self._price_cache) >= self.PRICE_CACHE_MAX_SIZE:
+            self._price_cache = {
+                address: entry for address, entry in self._price_cache.items()
+                if timestamp - entry[0] < self.price_cache_ttl
+            }
+        self._price_cache[token_address] = (timestamp, price)
 
     async def get_best_route(
         self,
@@ -22,29 +153,72 @@ class Jupiter:
     ) -> Optional[Dict[str, Any]]:
         """
         Holt die beste Swap-Route von Jupiter mit optimierten Parametern.
+        Gleichzeitige Anfragen mit identischen Parametern teilen sich eine Quote-Anfrage.
+        """
+        key = (input_mint, output_mint, int(amount), slippage_bps, platform_fee_bps)
+        pending = self._pending_routes.get(key)
+        if pending:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_routes[key] = future
+        route = None
+        try:
+            route = await self._fetch_route(*key)
+            return route
+        finally:
+            del self._pending_routes[key]
+            future.set_result(route)
+
+    async def get_quotes_batch(self, pairs: List[Tuple[str, str, float, int]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Holt Swap-Routen für mehrere Token-Paare parallel.
+
+        Args:
+            pairs: Tupel aus (input_mint, output_mint, amount, slippage_bps)
+
+        Returns:
+            Routen in der Reihenfolge der Paare (None, wenn keine Route gefunden wurde)
+        """
+        async def quote(input_mint: str, output_mint: str, amount: float, slippage_bps: int) -> Optional[Dict[str, Any]]:
+            async with self._quote_semaphore:
+                return await self.get_best_route(input_mint, output_mint, amount, slippage_bps)
+
+        return await asyncio.gather(*(quote(*pair) for pair in pairs))
+
+    async def _fetch_route(
+        self,
+        input_mint: str,
+        output_mint: str,
+        amount: int,
+        slippage_bps: int,
+        platform_fee_bps: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fragt eine Swap-Route bei der Jupiter Quote API ab.
         """
         try:
-            url = f"{self.BASE_URL}/quote"
+            url = self.QUOTE_URL
             params = {
                 "inputMint": input_mint,
                 "outputMint": output_mint,
-                "amount": str(int(amount)),
+                "amount": str(amount),
                 "slippageBps": slippage_bps,
                 "platformFeeBps": platform_fee_bps,
-                "restrictIntermediateTokens": True,  # Für stabilere Routen
-                "asLegacyTransaction": False  # Wir nutzen Versioned Transactions
+                "restrictIntermediateTokens": "true",  # Für stabilere Routen
+                "asLegacyTransaction": "false"  # Wir nutzen Versioned Transactions
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.logger.info(f"Route gefunden mit Output Amount: {data.get('outAmount')}")
-                        return data
-                    else:
-                        error_data = await response.text()
-                        self.logger.error(f"Jupiter Quote API Error: {response.status} - {error_data}")
-                        return None
+            session = get_shared_session()
+            async with request_with_retry(session, "GET", url, params=params) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    self.logger.info(f"Route gefunden mit Output Amount: {data.get('outAmount')}")
+                    return data
+                else:
+                    error_data = await response.text()
+                    self.logger.error(f"Jupiter Quote API Error: {response.status} - {error_data}")
+                    return None
 
         except Exception as e:
             self.logger.error(f"Fehler beim Abrufen der Route: {str(e)}")
@@ -59,32 +233,23 @@ class Jupiter:
         Erstellt und führt einen Swap basierend auf der Quote aus.
         """
         try:
-            url = f"{self.BASE_URL}/swap"
-            payload = {
+            url = self.SWAP_URL
+            payload = orjson.dumps({
                 "quoteResponse": quote_response,
                 "userPublicKey": wallet_public_key,
-                "dynamicComputeUnitLimit": True,  # Optimierte CU Nutzung
-                "dynamicSlippage": {
-                    "maxBps": 300  # Max 3% slippage für höhere Erfolgsrate
-                },
-                "prioritizationFeeLamports": {
-                    "priorityLevelWithMaxLamports": {
-                        "maxLamports": 10000000,
-                        "priorityLevel": "veryHigh"
-                    }
-                }
-            }
+                **_SWAP_STATIC
+            })
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        swap_response = await response.json()
-                        self.logger.info("Swap Transaktion erstellt")
-                        return swap_response
-                    else:
-                        error_data = await response.text()
-                        self.logger.error(f"Jupiter Swap API Error: {response.status} - {error_data}")
-                        return None
+            session = get_shared_session()
+            async with request_with_retry(session, "POST", url, data=payload, headers=_JSON_HEADERS) as response:
+                if response.status == 200:
+                    swap_response = orjson.loads(await response.read())
+                    self.logger.info("Swap Transaktion erstellt")
+                    return swap_response
+                else:
+                    error_data = await response.text()
+                    self.logger.error(f"Jupiter Swap API Error: {response.status} - {error_data}")
+                    return None
 
         except Exception as e:
             self.logger.error(f"Fehler beim Erstellen der Swap-Transaktion: {str(e)}")
@@ -95,26 +260,28 @@ class Jupiter:
         Sendet die Transaktion über Jupiters optimierten Transaction Sender.
         """
         try:
-            url = "https://worker.jup.ag/send-transaction"
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=transaction_payload,
-                    headers={
-                        "Accept": "application/json",
-                        "Content-Type": "application/json"
-                    }
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        tx_id = result.get("txid")
-                        self.logger.info(f"Transaktion erfolgreich gesendet: {tx_id}")
-                        return tx_id
-                    else:
-                        error_data = await response.text()
-                        self.logger.error(f"Transaction Submit Error: {response.status} - {error_data}")
-                        return None
+            url = self.SEND_TRANSACTION_URL
+
+            session = get_shared_session()
+            async with request_with_retry(
+                session,
+                "POST",
+                url,
+                data=orjson.dumps(transaction_payload),
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/json"
+                }
+            ) as response:
+                if response.status == 200:
+                    result = orjson.loads(await response.read())
+                    tx_id = result.get("txid")
+                    self.logger.info(f"Transaktion erfolgreich gesendet: {tx_id}")
+                    return tx_id
+                else:
+                    error_data = await response.text()
+                    self.logger.error(f"Transaction Submit Error: {response.status} - {error_data}")
+                    return None
 
         except Exception as e:
             self.logger.error(f"Fehler beim Senden der Transaktion: {str(e)}")
@@ -1,19 +1,44 @@
-import base58
+import asyncio
+import time
+from functools import lru_cache
+from solders.hash import Hash
+from solders.instruction import Instruction
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.transaction import Transaction
 from solders.system_program import transfer, TransferParams
 from solders.message import Message
 from solana.rpc.async_api import AsyncClient
-from typing import Dict, Any, Optional, List
+from solana.rpc.types import TokenAccountOpts
+from typing import AsyncIterator, Dict, Any, Optional, List
 from utils.logger import BotLogger
 
 
+@lru_cache(maxsize=4096)
+def _pk(address: str) -> Pubkey:
+    """
+    Dekodiert eine Base58-Adresse einmalig zu einem Pubkey.
+    """
+    return Pubkey.from_string(address)
+
+
+@lru_cache(maxsize=256)
+def _transfer_instruction(from_pubkey: Pubkey, recipient: str, lamports: int) -> Instruction:
+    """
+    Baut eine SOL-Transfer-Instruktion einmalig je (Absender, Empfänger, Betrag).
+    Pro Transaktion ändern sich nur Blockhash und Signatur.
+    """
+    return transfer(TransferParams(from_pubkey=from_pubkey, to_pubkey=_pk(recipient), lamports=lamports))
+
+
 class PhantomWallet:
     """
     Integration für Phantom Wallet zur Ausführung von Solana-Transaktionen.
     """
 
+    BLOCKHASH_MAX_AGE = 30.0  # Sekunden, deutlich unter der Gültigkeit von ~150 Blöcken
+    MAX_ACCOUNTS_PER_REQUEST = 100  # Limit von getMultipleAccounts
+
     def __init__(self, private_key: str, rpc_url: str = "https://api.mainnet-beta.solana.com", logger: Optional[BotLogger] = None):
         """
         Initialisiert die PhantomWallet-Klasse.
@@ -24,14 +49,19 @@ class PhantomWallet:
             logger: Logger-Instanz für Debugging und Fehler
         """
         self.client = AsyncClient(rpc_url)
-        self.keypair = Keypair.from_bytes(base58.b58decode(private_key))
+        self.keypair = Keypair.from_base58_string(private_key)
         self.public_key = self.keypair.pubkey()
         self.logger = logger or BotLogger()
+        self._cached_blockhash: Optional[Hash] = None
+        self._blockhash_fetched_at = 0.0
+        self._blockhash_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> bool:
-        """Verbindet mit dem Solana Netzwerk."""
+        """Verbindet mit dem Solana Netzwerk und prüft per getHealth, ob der RPC-Knoten bereit ist."""
         try:
-            await self.client.is_connected()
+            if not await self.client.is_connected():
+                self.logger.error("Verbindungsfehler: RPC-Knoten meldet sich nicht als gesund")
+                return False
             self.logger.info("Wallet erfolgreich verbunden")
             return True
         except Exception as e:
@@ -39,24 +69,123 @@ class PhantomWallet:
             return False
 
     async def disconnect(self):
-        """Trennt die Verbindung zum Solana Netzwerk."""
-        try:
-            await self.client.close()
+        """Trennt die Verbindung zum Solana Netzwerk und beendet den Blockhash-Task."""
+        pending = [self.client.close()]
+        if self._blockhash_task:
+            self._blockhash_task.cancel()
+            pending.append(self._blockhash_task)
+            self._blockhash_task = None
+
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]  # CancelledError des Tasks ist kein Fehler
+        if errors:
+            self.logger.error(f"Fehler beim Trennen der Verbindung: {str(errors[0])}")
+        else:
             self.logger.info("Wallet-Verbindung getrennt")
-        except Exception as e:
-            self.logger.error(f"Fehler beim Trennen der Verbindung: {str(e)}")
+
+    def start_blockhash_updater(self, interval: float = 2.0) -> None:
+        """
+        Startet einen Hintergrund-Task, der den letzten Blockhash regelmäßig aktualisiert.
+
+        Args:
+            interval: Abstand zwischen zwei Abfragen in Sekunden
+        """
+        if self._blockhash_task is None or self._blockhash_task.done():
+            self._blockhash_task = asyncio.create_task(self._update_blockhash(interval))
+
+    async def _update_blockhash(self, interval: float) -> None:
+        """Hält den zwischengespeicherten Blockhash aktuell, bis der Task abgebrochen wird."""
+        while True:
+            try:
+                await self._refresh_blockhash()
+            except Exception as e:
+                self.logger.warning(f"Blockhash-Aktualisierung fehlgeschlagen: {str(e)}")
+            await asyncio.sleep(interval)
+
+    async def _refresh_blockhash(self) -> Hash:
+        """Ruft den letzten Blockhash ab und speichert ihn zwischen."""
+        self._cached_blockhash = (await self.client.get_latest_blockhash()).value.blockhash
+        self._blockhash_fetched_at = time.monotonic()
+        return self._cached_blockhash
+
+    async def get_cached_blockhash(self) -> Hash:
+        """
+        Liefert den zwischengespeicherten Blockhash und fragt ihn nur neu ab,
+        wenn keiner vorhanden oder er älter als BLOCKHASH_MAX_AGE ist.
+
+        Returns:
+            Letzter bekannter Blockhash
+        """
+        if self._cached_blockhash is None or time.monotonic() - self._blockhash_fetched_at > self.BLOCKHASH_MAX_AGE:
+            return await self._refresh_blockhash()
+        return self._cached_blockhash
 
     async def get_balance(self) -> float:
         """Ruft den aktuellen SOL-Saldo der Wallet ab."""
         try:
             response = await self.client.get_balance(self.public_key)
             sol_balance = response.value / 1e9 if response.value is not None else 0.0
-            self.logger.info(f"Wallet-Saldo: {sol_balance:.6f} SOL")
+            self.logger.info("Wallet-Saldo: %.6f SOL", sol_balance)
             return sol_balance
         except Exception as e:
             self.logger.error(f"Fehler beim Abrufen des Wallet-Saldos: {str(e)}")
             return 0.0
 
+    async def get_multiple_balances(self, addresses: List[str]) -> Dict[str, float]:
+        """
+        Ruft die SOL-Salden mehrerer Adressen mit getMultipleAccounts ab.
+
+        Args:
+            addresses: Adressen (PublicKeys als String)
+
+        Returns:
+            Dictionary Adresse -> SOL-Saldo (0.0 für nicht existierende Konten), leer bei Fehler.
+        """
+        try:
+            chunks = [
+                addresses[i:i + self.MAX_ACCOUNTS_PER_REQUEST]
+                for i in range(0, len(addresses), self.MAX_ACCOUNTS_PER_REQUEST)
+            ]
+            responses = await asyncio.gather(*(
+                self.client.get_multiple_accounts([_pk(address) for address in chunk]) for chunk in chunks
+            ))
+            balances = {}
+            for chunk, response in zip(chunks, responses):
+                for address, account in zip(chunk, response.value):
+                    balances[address] = account.lamports / 1e9 if account else 0.0
+            return balances
+        except Exception as e:
+            self.logger.error(f"Fehler beim Abrufen mehrerer Salden: {str(e)}")
+            return {}
+
+    async def get_token_balance(self, token_address: str) -> float:
+        """
+        Ruft den Saldo eines SPL-Tokens der Wallet ab.
+
+        Der RPC-Knoten filtert die Token-Konten direkt nach Mint; die
+        jsonParsed-Antwort enthält den Betrag bereits.
+
+        Args:
+            token_address: Mint-Adresse des Tokens
+
+        Returns:
+            Token-Saldo (Summe aller Konten dieses Mints) oder 0.0 bei Fehler.
+        """
+        try:
+            response = await self.client.get_token_accounts_by_owner_json_parsed(
+                self.public_key,
+                TokenAccountOpts(mint=_pk(token_address))
+            )
+            balance = sum(
+                account.account.data.parsed["info"]["tokenAmount"]["uiAmount"] or 0.0
+                for account in response.value
+            )
+            self.logger.info("Token-Saldo %s: %s", token_address, balance)
+            return balance
+        except Exception as e:
+            self.logger.error(f"Fehler beim Abrufen des Token-Saldos für {token_address}: {str(e)}")
+            return 0.0
+
     async def send_transaction(self, transaction: Transaction) -> Optional[str]:
         """
         Sendet eine bereits erstellte und signierte Transaktion.
@@ -64,14 +193,27 @@ class PhantomWallet:
         Args:
             transaction: Eine Transaktion, die mit Transaction.new(...) erzeugt und signiert wurde.
 
+        Returns:
+            Transaktionssignatur als String oder None bei Fehler.
+        """
+        return await self.send_raw(bytes(transaction))
+
+    async def send_raw(self, raw_transaction: bytes) -> Optional[str]:
+        """
+        Sendet eine bereits serialisierte, signierte Transaktion.
+        Bei Wiederholungsversuchen muss die Transaktion so nur einmal serialisiert werden.
+
+        Args:
+            raw_transaction: Serialisierte Transaktion (bytes(transaction))
+
         Returns:
             Transaktionssignatur als String oder None bei Fehler.
         """
         try:
-            response = await self.client.send_raw_transaction(bytes(transaction))
+            response = await self.client.send_raw_transaction(raw_transaction)
             if response.value:
                 signature = str(response.value)
-                self.logger.info(f"Transaktion erfolgreich gesendet: {signature}")
+                self.logger.info("Transaktion erfolgreich gesendet: %s", signature)
                 return signature
             self.logger.error("Fehler: Keine Transaktionssignatur erhalten")
             return None
@@ -79,6 +221,18 @@ class PhantomWallet:
             self.logger.error(f"Fehler beim Senden der Transaktion: {str(e)}")
             return None
 
+    async def send_many(self, transactions: List[Transaction]) -> List[Optional[str]]:
+        """
+        Sendet mehrere signierte Transaktionen gleichzeitig.
+
+        Args:
+            transactions: Signierte Transaktionen
+
+        Returns:
+            Transaktionssignaturen in der Reihenfolge der Eingaben (None bei Fehler).
+        """
+        return await asyncio.gather(*(self.send_transaction(transaction) for transaction in transactions))
+
     async def transfer_sol(self, recipient: str, amount: float) -> Optional[str]:
         """
         Überweist SOL an eine andere Adresse.
@@ -92,14 +246,8 @@ class PhantomWallet:
         """
         try:
             lamports = int(amount * 1e9)  # Umwandlung von SOL in Lamports
-            blockhash = (await self.client.get_latest_blockhash()).value.blockhash
-            instruction = transfer(
-                TransferParams(
-                    from_pubkey=self.public_key,
-                    to_pubkey=Pubkey.from_string(recipient),
-                    lamports=lamports
-                )
-            )
+            blockhash = await self.get_cached_blockhash()
+            instruction = _transfer_instruction(self.public_key, recipient, lamports)
             
             message = Message.new_with_blockhash(
                 instructions=[instruction],
@@ -117,6 +265,31 @@ class PhantomWallet:
             self.logger.error(f"Fehler bei SOL-Überweisung an {recipient}: {str(e)}")
             return None
 
+    async def iter_recent_transactions(self, limit: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Liefert die letzten Transaktionen der Wallet einzeln, sodass Aufrufer früh abbrechen können.
+
+        Args:
+            limit: Maximale Anzahl der Transaktionen
+
+        Returns:
+            Asynchroner Iterator über die Transaktionen.
+        """
+        response = await self.client.get_signatures_for_address(self.public_key, limit=limit)
+        for tx in response.value or []:
+            yield self._format_signature(tx)
+
+    @staticmethod
+    def _format_signature(tx: Any) -> Dict[str, Any]:
+        """Wandelt einen Signatur-Eintrag der RPC-Antwort in ein Dictionary um."""
+        return {
+            'signature': tx.signature,
+            'slot': tx.slot,
+            'err': tx.err,
+            'memo': tx.memo,
+            'blockTime': tx.block_time,
+        }
+
     async def get_recent_transactions(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Ruft die letzten Transaktionen der Wallet ab.
@@ -128,16 +301,35 @@ class PhantomWallet:
             Liste der letzten Transaktionen.
         """
         try:
-            response = await self.client.get_signatures_for_address(self.public_key, limit=limit)
-            transactions = [{
-                'signature': tx.signature,
-                'slot': tx.slot,
-                'err': tx.err,
-                'memo': tx.memo,
-                'blockTime': tx.block_time,
-            } for tx in response.value] if response.value else []
-            self.logger.info(f"{len(transactions)} Transaktionen gefunden")
+            transactions = [tx async for tx in self.iter_recent_transactions(limit)]
+            self.logger.info("%d Transaktionen gefunden", len(transactions))
             return transactions
         except Exception as e:
             self.logger.error(f"Fehler beim Abrufen der Transaktionshistorie: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    async def get_recent_transactions_many(self, addresses: List[str], limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Ruft die letzten Transaktionen mehrerer Adressen gleichzeitig ab (eine RPC-Anfrage je Adresse).
+        Fehlgeschlagene Adressen werden protokolliert und liefern eine leere Liste.
+
+        Args:
+            addresses: Adressen (PublicKeys als String)
+            limit: Maximale Anzahl der Transaktionen je Adresse
+
+        Returns:
+            Dictionary Adresse -> Liste der letzten Transaktionen.
+        """
+        async def fetch(address: str) -> Any:
+            return await self.client.get_signatures_for_address(_pk(address), limit=limit)
+
+        responses = await asyncio.gather(*(fetch(address) for address in addresses), return_exceptions=True)
+
+        transactions: Dict[str, List[Dict[str, Any]]] = {}
+        for address, response in zip(addresses, responses):
+            if isinstance(response, Exception):
+                self.logger.error("Fehler beim Abrufen der Transaktionshistorie für %s: %s", address, response)
+                transactions[address] = []
+            else:
+                transactions[address] = [self._format_signature(tx) for tx in response.value]
+        return transactions
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from utils.logger import BotLogger
 from utils.helpers import Helpers
 
@@ -8,6 +8,8 @@ class RiskManager:
     Verwaltet Risiko-Parameter, Positionsgrößen und Handelsstatistiken.
     """
 
+    __slots__ = ("logger", "config", "daily_stats", "_equity_peak")
+
     def __init__(self, logger: BotLogger, config: Dict[str, Any]):
         """
         Initialisiert den Risk Manager.
@@ -17,7 +19,6 @@ class RiskManager:
             config: Trading-Konfiguration mit Risiko-Parametern
         """
         self.logger = logger
-        self.helpers = Helpers()
         self.config = config
         self.daily_stats = {
             "total_trades": 0,
@@ -25,8 +26,9 @@ class RiskManager:
             "losing_trades": 0,
             "total_pnl": 0.0,
             "max_drawdown": 0.0,
-            "last_reset": self.helpers.get_current_timestamp()
+            "last_reset": Helpers.get_current_timestamp()
         }
+        self._equity_peak = 0.0
 
     def validate_trade(self, current_budget: float, active_trades: int, trade_amount: float) -> bool:
         """
@@ -40,16 +42,17 @@ class RiskManager:
         Returns:
             True, wenn der Trade erlaubt ist, sonst False.
         """
-        if active_trades >= self.config["max_active_trades"]:
-            self.logger.warning("Maximale Anzahl aktiver Trades erreicht.")
+        # Budget zuerst: scheitert in der Praxis am häufigsten und braucht keine Konfiguration
+        if current_budget < trade_amount:
+            self.logger.warning(f"Unzureichendes Budget: {current_budget} < {trade_amount}")
             return False
 
         if trade_amount > self.config["max_position_size"]:
             self.logger.warning(f"Trade-Betrag überschreitet maximale Positionsgröße: {trade_amount}")
             return False
 
-        if current_budget < trade_amount:
-            self.logger.warning(f"Unzureichendes Budget: {current_budget} < {trade_amount}")
+        if active_trades >= self.config["max_active_trades"]:
+            self.logger.warning("Maximale Anzahl aktiver Trades erreicht.")
             return False
 
         return True
@@ -79,6 +82,32 @@ class RiskManager:
             self.logger.error(f"Fehler bei Positionsgrößen-Berechnung: {str(e)}")
             return 0
 
+    def calculate_position_sizes(self, entry_prices: List[float], stop_losses: List[float]) -> List[float]:
+        """
+        Berechnet die Positionsgrößen mehrerer Kandidaten in einem Durchlauf.
+
+        Die Risiko-Parameter werden nur einmal gelesen; ungültige Kombinationen
+        (kein Risiko oder Einstiegspreis 0) ergeben 0.
+
+        Args:
+            entry_prices: Einstiegspreise
+            stop_losses: Stop Loss Preise in derselben Reihenfolge
+
+        Returns:
+            Positionsgrößen in der Reihenfolge der Eingaben
+        """
+        try:
+            risk_per_trade = self.config["account_size"] * (self.config["risk_per_trade"] / 100)
+            max_position_size = self.config["max_position_size"]
+        except KeyError as e:
+            self.logger.error(f"Fehler bei Positionsgrößen-Berechnung: {str(e)}")
+            return [0] * len(entry_prices)
+
+        return [
+            min(risk_per_trade / abs(entry - stop), max_position_size / entry) if entry and entry != stop else 0
+            for entry, stop in zip(entry_prices, stop_losses)
+        ]
+
     def check_stop_loss(self, position: Dict[str, Any], current_price: float) -> bool:
         """
         Überprüft, ob die Stop Loss-Grenze erreicht wurde.
@@ -92,7 +121,7 @@ class RiskManager:
         """
         stop_loss = position.get("stop_loss")
         if stop_loss and current_price <= stop_loss:
-            self.logger.info(f"Stop Loss erreicht für {position['token']}. Preis: {current_price}")
+            self.logger.info("Stop Loss erreicht für %s. Preis: %s", position["token"], current_price)
             return True
         return False
 
@@ -109,7 +138,7 @@ class RiskManager:
         """
         take_profit = position.get("take_profit")
         if take_profit and current_price >= take_profit:
-            self.logger.info(f"Take Profit erreicht für {position['token']}. Preis: {current_price}")
+            self.logger.info("Take Profit erreicht für %s. Preis: %s", position["token"], current_price)
             return True
         return False
 
@@ -128,12 +157,13 @@ class RiskManager:
         else:
             self.daily_stats["losing_trades"] += 1
 
-        # Aktualisiere Drawdown
-        if pnl < 0:
-            current_drawdown = self.daily_stats["total_pnl"]
-            self.daily_stats["max_drawdown"] = min(self.daily_stats["max_drawdown"], current_drawdown)
+        # Drawdown gemessen vom bisherigen Höchststand der Tages-PnL
+        self._equity_peak = max(self._equity_peak, self.daily_stats["total_pnl"])
+        self.daily_stats["max_drawdown"] = min(
+            self.daily_stats["max_drawdown"], self.daily_stats["total_pnl"] - self._equity_peak
+        )
 
-        self.logger.info(f"Trading-Statistiken aktualisiert. PnL: {pnl}")
+        self.logger.info("Trading-Statistiken aktualisiert. PnL: %s", pnl)
 
     def reset_daily_stats(self) -> None:
         """
@@ -145,8 +175,9 @@ class RiskManager:
             "losing_trades": 0,
             "total_pnl": 0.0,
             "max_drawdown": 0.0,
-            "last_reset": self.helpers.get_current_timestamp()
+            "last_reset": Helpers.get_current_timestamp()
         }
+        self._equity_peak = 0.0
         self.logger.info("Tägliche Statistiken zurückgesetzt.")
 
     def get_risk_metrics(self) -> Dict[str, Any]:
@@ -1,13 +1,22 @@
-import aiohttp
+import asyncio
 import os
+import orjson
 from typing import Dict, List, Any
 from utils.logger import BotLogger
+from utils.http_session import get_shared_session
 
 class SentimentAnalyzer:
     """
     Token Sentiment-Analyse mit LunarCrush API.
     """
 
+    __slots__ = ("logger", "api_key", "base_url", "_request_semaphore", "_headers")
+
+    MAX_CONCURRENT_REQUESTS = 20  # Parallele Anfragen an LunarCrush begrenzen
+    THREADED_DECODE_THRESHOLD = 64 * 1024  # Größere Antworten werden außerhalb des Event-Loops dekodiert
+    MIN_GALAXY_SCORE = 60  # Mindest-Galaxy-Score für bullishes Sentiment
+    MIN_SENTIMENT_RELATIVE = 0.6  # Mindestanteil positiver Erwähnungen
+
     def __init__(self, logger: BotLogger):
         """
         Initialisiert den SentimentAnalyzer.
@@ -18,6 +27,8 @@ class SentimentAnalyzer:
         self.logger = logger
         self.api_key = os.getenv("LUNARCRUSH_API_KEY")
         self.base_url = "https://lunarcrush.com/api/v4"
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._headers = {"Authorization": f"Bearer {self.api_key}"}
 
         if not self.api_key:
             self.logger.error("LUNARCRUSH_API_KEY fehlt! Setze ihn in deiner .env Datei.")
@@ -33,19 +44,21 @@ class SentimentAnalyzer:
         Returns:
             JSON-Antwort als Dictionary oder leeres Dictionary bei Fehler
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
+        url = f"{self.base_url}/{endpoint}"
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=headers, params=params) as response:
+        try:
+            async with self._request_semaphore:
+                async with get_shared_session().get(url, headers=self._headers, params=params) as response:
                     if response.status == 200:
-                        return await response.json()
+                        raw = await response.read()
+                        if len(raw) > self.THREADED_DECODE_THRESHOLD:
+                            return await asyncio.to_thread(orjson.loads, raw)
+                        return orjson.loads(raw)
                     self.logger.error(f"LunarCrush API Fehler: {response.status}")
                     return {}
-            except Exception as e:
-                self.logger.error(f"LunarCrush Request Fehler: {str(e)}")
-                return {}
+        except Exception as e:
+            self.logger.error(f"LunarCrush Request Fehler: {str(e)}")
+            return {}
 
     async def get_token_sentiment(self, symbol: str) -> Dict[str, Any]:
         """
@@ -81,9 +94,21 @@ class SentimentAnalyzer:
             "tweet_sentiment": token_data.get("average_sentiment", 0)
         }
 
-        self.logger.info(f"Sentiment-Daten für {symbol}: {sentiment}")
+        self.logger.info("Sentiment-Daten für %s: %s", symbol, sentiment)
         return sentiment
 
+    async def get_token_sentiment_many(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """
+        Ruft die Sentiment-Daten mehrerer Tokens parallel ab.
+
+        Args:
+            symbols: Token Symbole
+
+        Returns:
+            Sentiment-Daten in der Reihenfolge der Symbole (leeres Dictionary bei Fehler)
+        """
+        return await asyncio.gather(*(self.get_token_sentiment(symbol) for symbol in symbols))
+
     async def get_trending_tokens(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Ruft die aktuell trendenden Tokens ab.
@@ -114,7 +139,7 @@ class SentimentAnalyzer:
             for token in data["data"]
         ]
 
-        self.logger.info(f"{len(trending_tokens)} trendende Tokens gefunden.")
+        self.logger.info("%d trendende Tokens gefunden.", len(trending_tokens))
         return trending_tokens
 
     def is_bullish_sentiment(self, sentiment: Dict[str, Any]) -> bool:
@@ -127,8 +152,7 @@ class SentimentAnalyzer:
         Returns:
             True wenn bullish, sonst False
         """
-        try:
-            return (sentiment.get("galaxy_score", 0) >= 60 and sentiment.get("sentiment_relative", 0) > 0.6)
-        except Exception as e:
-            self.logger.error(f"Fehler bei Bullish-Sentiment-Check: {str(e)}")
-            return False
+        return (
+            (sentiment.get("galaxy_score") or 0) >= self.MIN_GALAXY_SCORE
+            and (sentiment.get("sentiment_relative") or 0) > self.MIN_SENTIMENT_RELATIVE
+        )
@@ -1,6 +1,9 @@
-import aiohttp
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from utils.logger import BotLogger
+from utils.http_session import get_shared_session
 
 class SolanaSniffer:
     """
@@ -8,6 +11,9 @@ class SolanaSniffer:
     """
 
     BASE_URL = "https://api.solanasniffer.com/v1"
+    MAX_CONCURRENT_REQUESTS = 20  # Parallele Anfragen an SolanaSniffer begrenzen
+    CACHE_TTL = 120  # Sekunden, für die eine Sicherheitsbewertung wiederverwendet wird
+    CACHE_MAX_SIZE = 4096
 
     def __init__(self, logger: Optional[BotLogger] = None):
         """
@@ -17,6 +23,8 @@ class SolanaSniffer:
             logger: Logger-Instanz für Debugging und Protokollierung
         """
         self.logger = logger or BotLogger()
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -30,21 +38,22 @@ class SolanaSniffer:
             Antwortdaten als Dictionary
         """
         url = f"{self.BASE_URL}/{endpoint}"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, params=params) as response:
+        try:
+            async with self._request_semaphore:
+                async with get_shared_session().get(url, params=params) as response:
                     if response.status == 200:
                         return await response.json()
                     else:
                         self.logger.error(f"SolanaSniffer API-Fehler: {response.status}")
                         return {}
-            except Exception as e:
-                self.logger.error(f"Fehler bei der Anfrage an SolanaSniffer: {str(e)}")
-                return {}
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Anfrage an SolanaSniffer: {str(e)}")
+            return {}
 
     async def check_contract(self, token_address: str) -> Dict[str, Any]:
         """
         Überprüft einen Token auf Sicherheitsrisiken.
+        Erfolgreiche Bewertungen werden für CACHE_TTL Sekunden zwischengespeichert.
 
         Args:
             token_address: Adresse des zu überprüfenden Tokens
@@ -52,10 +61,20 @@ class SolanaSniffer:
         Returns:
             Sicherheitsbewertung und Analyseergebnisse
         """
+        now = time.monotonic()
+        cached = self._cache.get(token_address)
+        if cached and now - cached[0] < self.CACHE_TTL:
+            self._cache.move_to_end(token_address)
+            return cached[1]
+
         try:
             response = await self._make_request("analyze", {"address": token_address})
             if response and "safety_score" in response:
-                self.logger.info(f"Token-Sicherheitsbewertung: {response['safety_score']} für {token_address}")
+                self.logger.info("Token-Sicherheitsbewertung: %s für %s", response["safety_score"], token_address)
+                self._cache[token_address] = (now, response)
+                self._cache.move_to_end(token_address)
+                if len(self._cache) > self.CACHE_MAX_SIZE:
+                    self._cache.popitem(last=False)
                 return response
             else:
                 self.logger.warning(f"Keine Sicherheitsbewertung für Token: {token_address}")
@@ -64,6 +83,18 @@ class SolanaSniffer:
             self.logger.error(f"Fehler bei der Sicherheitsprüfung des Tokens: {str(e)}")
             return {}
 
+    async def check_contracts(self, token_addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        Überprüft mehrere Tokens parallel auf Sicherheitsrisiken.
+
+        Args:
+            token_addresses: Adressen der zu überprüfenden Tokens
+
+        Returns:
+            Analyseergebnisse in der Reihenfolge der Adressen (leeres Dictionary bei Fehler)
+        """
+        return await asyncio.gather(*(self.check_contract(address) for address in token_addresses))
+
     def is_safe(self, analysis: Dict[str, Any], threshold: int = 85) -> bool:
         """
         Überprüft, ob ein Token als sicher gilt.
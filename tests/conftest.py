@@ -0,0 +1,20 @@
+import pytest
+from utils.http_session import close_shared_session
+from utils.logger import BotLogger
+
+
+@pytest.fixture(scope="session")
+def logger():
+    """
+    Gemeinsame Logger-Instanz für alle Tests
+    """
+    return BotLogger()
+
+
+@pytest.fixture(autouse=True)
+async def close_http_session():
+    """
+    Schließt die geteilte HTTP-Session nach jedem Test, solange dessen Event-Loop noch läuft
+    """
+    yield
+    await close_shared_session()
@@ -1,19 +1,27 @@
+import copy
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, MagicMock, patch, AsyncMock
 from services.dexscreener import DexScreener
-from utils.logger import BotLogger
+
+FILTERS = {
+    "liquidity_min": 20_000,
+    "market_cap": {"min": 100_000, "max": 2_000_000},
+    "hourly_transactions": 200,
+    "buy_sell_ratio": 1.5
+}
+
+
+@pytest.fixture(scope="module")
+def dexscreener(logger):
+    """Geteilte Instanz für Tests, die keinen Zustand verändern"""
+    return DexScreener(logger, copy.deepcopy(FILTERS))
+
 
 @pytest.fixture
-def dexscreener():
-    logger = BotLogger()
-    filters = {
-        "liquidity_min": 20_000,
-        "market_cap": {"min": 100_000, "max": 2_000_000},
-        "hourly_transactions": 200,
-        "buy_sell_ratio": 1.5
-    }
-    return DexScreener(logger, filters)
+def fresh_dexscreener(logger, tmp_path):
+    """Eigene Instanz für Tests, die Caches befüllen"""
+    return DexScreener(logger, copy.deepcopy(FILTERS), token_cache_file=str(tmp_path / "token_metadata.json"))
 
 
 @pytest.mark.asyncio
@@ -59,3 +67,68 @@ async def test_error_handling(dexscreener):
 
         price = await dexscreener.get_token_price("test_token_address")
         assert price == 0.0
+
+
+@pytest.mark.asyncio
+async def test_get_filtered_tokens_not_modified(fresh_dexscreener):
+    dexscreener = fresh_dexscreener
+    pairs = [{"baseToken": {"symbol": "SOL", "address": "address_1"}}]
+    first = MagicMock(status=200, headers={"ETag": '"v1"'}, read=AsyncMock(return_value=b'{"pairs": [{"baseToken": {"symbol": "SOL", "address": "address_1"}}]}'))
+    second = MagicMock(status=304, headers={})
+    session = MagicMock()
+    session.request = AsyncMock(side_effect=[first, second])
+
+    with patch("services.dexscreener.get_shared_session", return_value=session):
+        assert await dexscreener.get_filtered_tokens("solana") == pairs
+        assert await dexscreener.get_filtered_tokens("solana") == pairs
+        assert session.request.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_get_token_infos_concurrent(dexscreener):
+    """Testet, dass mehrere Token-Infos parallel und in Eingabereihenfolge geladen werden"""
+    async def fake_get_token_info(address):
+        await asyncio.sleep(0.01 if address == "address_1" else 0)
+        return {"address": address}
+
+    with patch.object(dexscreener, "get_token_info", side_effect=fake_get_token_info) as get_token_info:
+        infos = await dexscreener.get_token_infos(["address_1", "address_2"])
+
+    assert infos == [{"address": "address_1"}, {"address": "address_2"}]
+    assert get_token_info.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_token_metadata_cached_on_disk(fresh_dexscreener):
+    """Testet, dass statische Token-Metadaten nur einmal abgefragt und auf Platte gespeichert werden"""
+    dexscreener = fresh_dexscreener
+    token_info = {"pairs": [{"baseToken": {"address": "address_1", "name": "Solana", "symbol": "SOL"}, "dexId": "raydium", "url": "https://dexscreener.com/solana/address_1"}]}
+
+    with patch.object(dexscreener, "get_token_info", new=AsyncMock(return_value=token_info)) as get_token_info:
+        metadata = await dexscreener.get_token_metadata("address_1")
+        assert metadata["symbol"] == "SOL"
+        assert metadata["dex_id"] == "raydium"
+        assert await dexscreener.get_token_metadata("address_1") == metadata
+        get_token_info.assert_awaited_once()
+
+    reloaded = DexScreener(dexscreener.logger, dexscreener.filters, token_cache_file=dexscreener.token_cache_file)
+    with patch.object(reloaded, "get_token_info", new=AsyncMock()) as get_token_info:
+        assert (await reloaded.get_token_metadata("address_1"))["symbol"] == "SOL"
+        get_token_info.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_token_info_retries_rate_limit(dexscreener):
+    """Testet, dass ein 429 unter Beachtung von Retry-After wiederholt wird"""
+    limited = MagicMock(status=429, headers={"Retry-After": "2"})
+    ok = MagicMock(status=200, headers={}, read=AsyncMock(return_value=b'{"pairs": []}'))
+    session = MagicMock()
+    session.request = AsyncMock(side_effect=[limited, ok])
+
+    with patch("services.dexscreener.get_shared_session", return_value=session), \
+            patch("utils.http_session.asyncio.sleep", new=AsyncMock()) as sleep:
+        assert await dexscreener.get_token_info("address_1") == {"pairs": []}
+
+    sleep.assert_awaited_once_with(2.0)
+    limited.release.assert_called_once()
+    assert session.request.await_count == 2
@@ -1,14 +1,13 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 from services.jupiter import Jupiter
-from utils.logger import BotLogger
 
 @pytest.fixture
-def jupiter():
+def jupiter(logger):
     """
     Test Fixture für Jupiter-Instanz
     """
-    logger = BotLogger()
     return Jupiter(logger)
 
 @pytest.mark.asyncio
@@ -185,4 +184,86 @@ async def test_validation(jupiter):
             output_mint="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
             amount=1.0,
             slippage=50  # Zu hoch
-        )
\ No newline at end of file
+        )
+
+@pytest.mark.asyncio
+async def test_get_token_prices_batches_and_caches(jupiter):
+    """
+    Test für gebündelte Preisabfragen mit Cache
+    """
+    mints = [f"mint_{i}" for i in range(150)]
+    fetch_prices = AsyncMock(side_effect=lambda batch: {mint: 1.0 for mint in batch})
+
+    with patch.object(jupiter, "_fetch_prices", new=fetch_prices):
+        prices = await jupiter.get_token_prices(mints)
+        assert len(prices) == 150
+        assert fetch_prices.await_count == 2  # 100 + 50 IDs
+
+        # Zweiter Aufruf wird vollständig aus dem Cache bedient
+        assert await jupiter.get_token_price("mint_0") == 1.0
+        assert fetch_prices.await_count == 2
+
+@pytest.mark.asyncio
+async def test_get_token_prices_coalesces_concurrent_requests(jupiter):
+    """
+    Test, dass gleichzeitige Preisabfragen für denselben Token nur eine Anfrage auslösen
+    """
+    async def slow_fetch(batch):
+        await asyncio.sleep(0.01)
+        return {mint: 2.5 for mint in batch}
+
+    fetch_prices = AsyncMock(side_effect=slow_fetch)
+
+    with patch.object(jupiter, "_fetch_prices", new=fetch_prices):
+        results = await asyncio.gather(*(jupiter.get_token_price("mint_1") for _ in range(5)))
+
+    assert results == [2.5] * 5
+    assert fetch_prices.await_count == 1
+
+@pytest.mark.asyncio
+async def test_get_best_route_single_flight(jupiter):
+    """
+    Test, dass identische gleichzeitige Quote-Anfragen zusammengelegt werden
+    """
+    route = {"outAmount": "1000"}
+
+    async def slow_fetch(*args):
+        await asyncio.sleep(0.01)
+        return route
+
+    fetch_route = AsyncMock(side_effect=slow_fetch)
+
+    with patch.object(jupiter, "_fetch_route", new=fetch_route):
+        results = await asyncio.gather(*(
+            jupiter.get_best_route("mint_in", "mint_out", 1_000_000) for _ in range(3)
+        ))
+        assert results == [route] * 3
+        assert fetch_route.await_count == 1
+
+        # Nach Abschluss wird wieder frisch angefragt
+        await jupiter.get_best_route("mint_in", "mint_out", 1_000_000)
+        assert fetch_route.await_count == 2
+
+@pytest.mark.asyncio
+async def test_get_quotes_batch(jupiter):
+    """
+    Test für parallele Quote-Abfragen mehrerer Paare
+    """
+    async def fake_fetch(input_mint, output_mint, amount, slippage_bps, platform_fee_bps):
+        if input_mint == "mint_bad":
+            return None
+        return {"inputMint": input_mint, "outAmount": str(amount * 2)}
+
+    with patch.object(jupiter, "_fetch_route", new=AsyncMock(side_effect=fake_fetch)) as fetch_route:
+        quotes = await jupiter.get_quotes_batch([
+            ("mint_a", "mint_out", 100, 50),
+            ("mint_bad", "mint_out", 100, 50),
+            ("mint_b", "mint_out", 300, 100)
+        ])
+
+    assert quotes == [
+        {"inputMint": "mint_a", "outAmount": "200"},
+        None,
+        {"inputMint": "mint_b", "outAmount": "600"}
+    ]
+    assert fetch_route.await_count == 3
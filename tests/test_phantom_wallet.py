@@ -1,15 +1,14 @@
 import pytest
 from unittest.mock import AsyncMock, patch
-from services.phantom_wallet import PhantomWallet
-from utils.logger import BotLogger
-from solders.transaction import Transaction
 
 @pytest.fixture
-def phantom_wallet():
+def phantom_wallet(logger):
     """
     Test Fixture für PhantomWallet-Instanz.
     """
-    logger = BotLogger()
+    # solana/solders erst bei Bedarf laden, nicht schon beim Sammeln der Tests
+    from services.phantom_wallet import PhantomWallet
+
     private_key = "4NwMH9qEP5gYdpHNxhSgRh4e5V4LrHvG5uKhKHoKHjYvGmZE3wsxqNcMbpuuT5GoAiCczSuXkPvhQEqxwQpvZXJu"  # Example private key for testing
     return PhantomWallet(private_key, rpc_url="https://api.mainnet-beta.solana.com", logger=logger)
 
@@ -60,6 +59,8 @@ async def test_sign_transaction_success(phantom_wallet):
     """
     Test für erfolgreiche Transaktionssignierung.
     """
+    from solders.transaction import Transaction
+
     transaction = Transaction()
     with patch("services.phantom_wallet.Transaction.sign", return_value=transaction):
         signed_transaction = await phantom_wallet.sign_transaction(transaction)
@@ -70,6 +71,8 @@ async def test_sign_transaction_failure(phantom_wallet):
     """
     Test für fehlgeschlagene Transaktionssignierung.
     """
+    from solders.transaction import Transaction
+
     transaction = Transaction()
     with patch("services.phantom_wallet.Transaction.sign", side_effect=Exception("Signaturfehler")):
         signed_transaction = await phantom_wallet.sign_transaction(transaction)
@@ -80,6 +83,8 @@ async def test_send_transaction_success(phantom_wallet):
     """
     Test für erfolgreiche Transaktionsausführung.
     """
+    from solders.transaction import Transaction
+
     mock_response = AsyncMock()
     mock_response.value = "mock_signature"
 
@@ -93,6 +98,8 @@ async def test_send_transaction_failure(phantom_wallet):
     """
     Test für fehlgeschlagene Transaktionsausführung.
     """
+    from solders.transaction import Transaction
+
     with patch.object(phantom_wallet.client, "send_raw_transaction", side_effect=Exception("Sende-Fehler")):
         transaction = Transaction()
         signature = await phantom_wallet.send_transaction(transaction)
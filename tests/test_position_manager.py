@@ -0,0 +1,110 @@
+import orjson
+import pytest
+from utils.position_manager import PositionManager
+
+@pytest.fixture
+def position_files(tmp_path):
+    """
+    Pfade für positions.json und die Historie in einem eigenen Verzeichnis
+    """
+    return str(tmp_path / "data" / "positions.json"), str(tmp_path / "data" / "closed_positions.jsonl")
+
+def read_history(path):
+    with open(path, "rb") as file:
+        return [orjson.loads(line) for line in file.read().splitlines()]
+
+def test_close_position_moves_to_history(logger, position_files):
+    """
+    Test, dass geschlossene Positionen in die Historie wandern und nach einem Neustart nicht mehr aktiv sind
+    """
+    positions_file, history_file = position_files
+    manager = PositionManager(logger, positions_file, history_file)
+    closed_id = manager.open_position("token_a", 1.0, 10, stop_loss=0.9, take_profit=1.5)
+    open_id = manager.open_position("token_b", 2.0, 5)
+
+    closed = manager.close_position(closed_id, 1.5)
+    assert closed["status"] == "closed"
+    assert closed["realized_pnl"] == pytest.approx(5.0)
+    assert manager.check_position_exits(1.5, "token_a") == []
+
+    history = read_history(history_file)
+    assert [entry["position_id"] for entry in history] == [closed_id]
+    assert history[0]["exit_price"] == 1.5
+
+    restarted = PositionManager(logger, positions_file, history_file)
+    assert list(restarted.active_positions) == [open_id]
+    assert len(read_history(history_file)) == 1
+
+def test_closed_positions_migrated_on_startup(logger, position_files):
+    """
+    Test, dass geschlossene Positionen aus einer älteren positions.json beim Start in die Historie verschoben werden
+    """
+    positions_file, history_file = position_files
+    manager = PositionManager(logger, positions_file, history_file)
+    open_id = manager.open_position("token_a", 1.0, 10)
+    legacy = dict(manager.active_positions)
+    legacy["old_position"] = {**legacy[open_id], "status": "closed", "exit_price": 2.0, "realized_pnl": 10.0}
+    with open(positions_file, "wb") as file:
+        file.write(orjson.dumps(legacy))
+
+    migrated = PositionManager(logger, positions_file, history_file)
+
+    assert list(migrated.active_positions) == [open_id]
+    assert [entry["position_id"] for entry in read_history(history_file)] == ["old_position"]
+    with open(positions_file, "rb") as file:
+        assert list(orjson.loads(file.read())) == [open_id]
+
+def test_close_position_history_failure_keeps_position_open(logger, tmp_path):
+    """
+    Test, dass eine Position offen bleibt, wenn die Historie nicht geschrieben werden kann
+    """
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    manager = PositionManager(logger, str(tmp_path / "positions.json"), str(blocker / "closed.jsonl"))
+    position_id = manager.open_position("token_a", 1.0, 10, stop_loss=0.9)
+
+    assert manager.close_position(position_id, 0.8) is None
+    assert manager.active_positions[position_id]["status"] == "open"
+    assert "exit_price" not in manager.active_positions[position_id]
+    assert manager.check_position_exits(0.8, "token_a") == [position_id]
+
+def test_failed_migration_keeps_closed_positions_inactive(logger, tmp_path):
+    """
+    Test, dass nicht migrierte geschlossene Positionen weder aktiv sind noch als Exit gemeldet werden
+    """
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    positions_file = tmp_path / "positions.json"
+    positions_file.write_bytes(orjson.dumps({
+        "old_position": {
+            "token": "token_a", "entry_price": 1.0, "amount": 10, "stop_loss": 0.9,
+            "take_profit": None, "status": "closed", "realized_pnl": -1.0
+        }
+    }))
+
+    manager = PositionManager(logger, str(positions_file), str(blocker / "closed.jsonl"))
+
+    assert "old_position" in manager.active_positions
+    assert manager.get_active_positions() == []
+    assert manager.check_position_exits(0.5, "token_a") == []
+    assert manager.close_position("old_position", 0.5) is None
+
+def test_close_after_crash_does_not_duplicate_history(logger, position_files):
+    """
+    Test, dass eine Position nach einem Absturz vor dem Speichern nicht doppelt in der Historie landet
+    """
+    positions_file, history_file = position_files
+    manager = PositionManager(logger, positions_file, history_file)
+    position_id = manager.open_position("token_a", 1.0, 10)
+    with open(positions_file, "rb") as file:
+        before_close = file.read()
+    manager.close_position(position_id, 2.0)
+
+    # Absturz vor dem Speichern: positions.json enthält die Position noch als offen
+    with open(positions_file, "wb") as file:
+        file.write(before_close)
+    restarted = PositionManager(logger, positions_file, history_file)
+    assert restarted.close_position(position_id, 2.0) is not None
+
+    assert [entry["position_id"] for entry in read_history(history_file)] == [position_id]
+    assert restarted.get_active_positions() == []
@@ -1,10 +1,9 @@
 import pytest
 from unittest.mock import MagicMock
 from services.risk_management import RiskManager
-from utils.logger import BotLogger
 
 @pytest.fixture
-def risk_manager():
+def risk_manager(logger):
     """
     Test Fixture für RiskManager-Instanz
     """
@@ -18,7 +17,6 @@ def risk_manager():
         "take_profit_percentage": 10.0,
         "min_risk_reward_ratio": 2.0
     }
-    logger = BotLogger()
     return RiskManager(logger=logger, config=config)
 
 def test_check_trade_allowed_success(risk_manager):
@@ -65,6 +63,13 @@ def test_calculate_position_size_zero_risk(risk_manager):
     result = risk_manager.calculate_position_size(price=100.0, stop_loss=100.0)
     assert result == 0.0
 
+def test_calculate_position_sizes(risk_manager):
+    """
+    Test für Batch-Berechnung der Positionsgrößen
+    """
+    result = risk_manager.calculate_position_sizes([100.0, 100.0, 10.0], [95.0, 100.0, 9.0])
+    assert result == pytest.approx([2.0, 0.0, 10.0])
+
 def test_update_trade_stats(risk_manager):
     """
     Test für Aktualisierung der Handelsstatistiken
@@ -1,14 +1,12 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from services.solana_sniffer import SolanaSniffer
-from utils.logger import BotLogger
 
 @pytest.fixture
-def sniffer():
+def sniffer(logger):
     """
     Test Fixture für SolanaSniffer-Instanz
     """
-    logger = BotLogger()
     return SolanaSniffer(
         logger=logger,
         rpc_url="https://api.mainnet-beta.solana.com"
@@ -1,5 +1,7 @@
 import os
 import json
+import hashlib
+import orjson
 from dotenv import load_dotenv
 from typing import Dict, Any
 
@@ -17,6 +19,8 @@ class ConfigLoader:
         
         # Lade Umgebungsvariablen
         load_dotenv(env_file)
+        # Momentaufnahme der Umgebung; Änderungen zur Laufzeit erst nach reload_env() sichtbar
+        self._env: Dict[str, str] = dict(os.environ)
 
         # Standard-Konfiguration
         self.default_config = {
@@ -51,6 +55,10 @@ class ConfigLoader:
 
         # Lade JSON und merge mit Defaults
         self.config_data = self._load_json_config()
+        # Punkt-Pfade ("trading.max_budget") -> Wert, damit get() nur einen Lookup braucht
+        self._flat = self._flatten(self.config_data)
+        # Hash des zuletzt geschriebenen Zustands je Datei, um unveränderte Zustände nicht erneut zu schreiben
+        self._state_digests: Dict[str, bytes] = {}
 
     def _load_json_config(self) -> Dict[str, Any]:
         """
@@ -59,8 +67,8 @@ class ConfigLoader:
         config = self.default_config.copy()
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, "r") as file:
-                    user_config = json.load(file)
+                with open(self.config_file, "rb") as file:
+                    user_config = orjson.loads(file.read())
                     self._deep_update(config, user_config)
             except json.JSONDecodeError as e:
                 raise ValueError(f"Fehler beim Laden von {self.config_file}: {e}")
@@ -68,46 +76,79 @@ class ConfigLoader:
 
     def _deep_update(self, base: Dict, updates: Dict) -> None:
         """
-        Aktualisiert rekursiv ein verschachteltes Dictionary.
+        Aktualisiert ein verschachteltes Dictionary (iterativ, ohne Rekursionstiefe-Limit).
         """
-        for key, value in updates.items():
-            if isinstance(value, dict) and key in base:
-                self._deep_update(base[key], value)
-            else:
-                base[key] = value
+        stack = [(base, updates)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
+
+    @staticmethod
+    def _flatten(config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Erstellt ein flaches Dictionary aller Punkt-Pfade, inklusive der Zwischenknoten.
+        """
+        flat: Dict[str, Any] = {}
+        stack = [("", config)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                path = f"{prefix}{key}"
+                flat[path] = value
+                if isinstance(value, dict):
+                    stack.append((f"{path}.", value))
+        return flat
 
     def get(self, key: str, default: Any = None) -> Any:
         """
         Holt einen Wert aus ENV > JSON > Default-Werten.
         """
-        env_value = os.getenv(key)
+        env_value = self._env.get(key)
         if env_value is not None:
             return env_value
         
-        keys = key.split('.')
-        value = self.config_data
-        for k in keys:
-            if k in value:
-                value = value[k]
-            else:
-                return default
-        return value
+        return self._flat.get(key, default)
+
+    def reload_env(self) -> None:
+        """
+        Lädt die .env-Datei erneut und aktualisiert die Momentaufnahme der Umgebung.
+        """
+        load_dotenv(self.env_file)
+        self._env = dict(os.environ)
 
     def save_state(self, state: Dict[str, Any], filename: str = 'data/trading_state.json') -> None:
         """
-        Speichert den aktuellen Trading-Zustand in einer JSON-Datei.
+        Speichert den aktuellen Trading-Zustand atomar in einer JSON-Datei.
+
+        Der Zustand wird in eine temporäre Datei geschrieben und per os.replace
+        übernommen, sodass Leser nie eine halb geschriebene Datei sehen. Ist der
+        Zustand seit dem letzten Speichern unverändert, wird nichts geschrieben.
         """
+        data = orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if self._state_digests.get(filename) == digest and os.path.exists(filename):
+            return
+
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, "w") as file:
-            json.dump(state, file, indent=4)
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_filename, filename)
+        self._state_digests[filename] = digest
 
     def load_state(self, filename: str = 'data/trading_state.json') -> Dict[str, Any]:
         """
         Lädt einen gespeicherten Trading-Zustand aus einer JSON-Datei.
         """
         try:
-            with open(filename, "r") as file:
-                return json.load(file)
+            with open(filename, "rb") as file:
+                return orjson.loads(file.read())
         except FileNotFoundError:
             return {}
 
@@ -117,7 +158,7 @@ class ConfigLoader:
         """
         required_env_vars = ['BOT_WALLET_ADDRESS', 'BOT_PRIVATE_KEY']
         for var in required_env_vars:
-            if not os.getenv(var):
+            if not self._env.get(var):
                 raise ValueError(f"Fehlende Umgebungsvariable: {var}")
 
         if self.get('trading.position_size') > self.get('trading.max_budget'):
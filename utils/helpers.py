@@ -1,36 +1,51 @@
+import asyncio
 import json
+import orjson
+import random
 import time
-from datetime import datetime
 from decimal import Decimal, ROUND_DOWN
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, Tuple, Type
 
 class Helpers:
     """
     Utility-Funktionen für den Trading-Bot
     """
 
+    # Datum und Uhrzeit der zuletzt formatierten Sekunde für get_current_timestamp
+    _timestamp_second = -1
+    _timestamp_prefix = ""
+
     @staticmethod
     def format_amount(amount: float, decimals: int = 8) -> str:
         """
         Formatiert einen Betrag mit der korrekten Anzahl von Dezimalstellen.
+        Überzählige Stellen werden abgeschnitten (wie ROUND_DOWN), direkt auf der Dezimaldarstellung.
         """
-        return str(Decimal(str(amount)).quantize(Decimal('0.' + '0' * decimals), rounding=ROUND_DOWN))
+        text = str(amount)
+        if "e" in text or "n" in text:  # Exponentialschreibweise, inf oder nan
+            return str(Decimal(text).quantize(Decimal('0.' + '0' * decimals), rounding=ROUND_DOWN))
+        integer, _, fraction = text.partition(".")
+        if decimals <= 0:
+            return integer
+        return f"{integer}.{fraction[:decimals].ljust(decimals, '0')}"
 
     @staticmethod
     def safe_divide(a: float, b: float, default: float = 0.0) -> float:
         """
         Sichere Division mit Standardwert bei Division durch 0.
         """
-        try:
-            return a / b if b != 0 else default
-        except Exception:
-            return default
+        return a / b if b else default
 
     @staticmethod
     def retry(func: Callable, retries: int = 3, delay: float = 1.0, *args, **kwargs) -> Any:
         """
         Wiederholt eine Funktion bei Fehlern.
+        Für Coroutine-Funktionen wird async_retry zurückgegeben, das awaited werden muss,
+        damit Wartezeiten den Event-Loop nicht blockieren.
         """
+        if asyncio.iscoroutinefunction(func):
+            return Helpers.async_retry(func, retries, delay, *args, **kwargs)
+
         for attempt in range(retries):
             try:
                 return func(*args, **kwargs)
@@ -40,14 +55,46 @@ class Helpers:
                 else:
                     raise e
 
+    @staticmethod
+    async def async_retry(
+        func: Callable,
+        retries: int = 3,
+        delay: float = 1.0,
+        *args,
+        max_delay: float = 30.0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        **kwargs
+    ) -> Any:
+        """
+        Wiederholt eine Coroutine-Funktion bei Fehlern mit exponentiellem Backoff und Jitter.
+
+        Args:
+            func: Coroutine-Funktion
+            retries: Maximale Anzahl an Versuchen
+            delay: Basis-Wartezeit in Sekunden (verdoppelt sich je Versuch)
+            max_delay: Obergrenze der Wartezeit in Sekunden
+            retry_on: Exception-Typen, die einen neuen Versuch auslösen; andere werden sofort weitergereicht
+
+        Returns:
+            Rückgabewert der Coroutine
+        """
+        for attempt in range(retries):
+            try:
+                return await func(*args, **kwargs)
+            except retry_on:
+                if attempt == retries - 1:
+                    raise
+                backoff = min(delay * 2 ** attempt, max_delay)
+                await asyncio.sleep(backoff + random.uniform(0, backoff / 2))
+
     @staticmethod
     def load_json(filepath: str) -> Dict[str, Any]:
         """
         Lädt JSON-Daten aus einer Datei sicher.
         """
         try:
-            with open(filepath, "r") as file:
-                return json.load(file)
+            with open(filepath, "rb") as file:
+                return orjson.loads(file.read())
         except FileNotFoundError:
             return {}
         except json.JSONDecodeError as e:
@@ -58,15 +105,22 @@ class Helpers:
         """
         Speichert Daten als JSON in einer Datei.
         """
-        with open(filepath, "w") as file:
-            json.dump(data, file, indent=4)
+        with open(filepath, "wb") as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     @staticmethod
     def get_current_timestamp() -> str:
         """
-        Gibt den aktuellen Zeitstempel im ISO-Format zurück.
+        Gibt den aktuellen Zeitstempel (lokale Zeit) im ISO-Format zurück, wie datetime.now().isoformat().
+        Datum und Uhrzeit werden nur einmal pro Sekunde formatiert.
         """
-        return datetime.now().isoformat()
+        second, microsecond = divmod(time.time_ns() // 1000, 1_000_000)
+        if second != Helpers._timestamp_second:
+            Helpers._timestamp_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            Helpers._timestamp_second = second
+        if microsecond:
+            return f"{Helpers._timestamp_prefix}.{microsecond:06d}"
+        return Helpers._timestamp_prefix
 
     @staticmethod
     def calculate_percentage_change(old_value: float, new_value: float, default: float = 0.0) -> float:
@@ -0,0 +1,131 @@
+import asyncio
+import aiohttp
+import orjson
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Set
+
+# Eine Session je Event-Loop: aiohttp-Sessions und ihre Verbindungen gehören zu dem Loop,
+# in dem sie erstellt wurden
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+# Schließvorgänge für Sessions bereits beendeter Loops (Referenz hält die Tasks am Leben)
+_closing: Set["asyncio.Task[None]"] = set()
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+MAX_RETRY_DELAY = 30.0
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Liefert die prozessweit geteilte aiohttp-Session und erstellt sie bei Bedarf.
+
+    Alle HTTP-Services nutzen denselben Connection-Pool, sodass TCP- und
+    TLS-Verbindungen zwischen Anfragen wiederverwendet werden. Muss innerhalb
+    eines laufenden Event-Loops aufgerufen werden; jeder Loop erhält eine eigene
+    Session. Sessions bereits geschlossener Loops werden dabei geschlossen.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        _close_stale_sessions(loop)
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=64,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=15, connect=3),
+            # Brotli wird über aiohttp[speedups] transparent dekodiert
+            headers={"Accept-Encoding": "gzip, deflate, br"},
+            json_serialize=lambda obj: orjson.dumps(obj).decode()
+        )
+        _sessions[loop] = session
+    return session
+
+
+def _close_stale_sessions(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Entfernt Sessions beendeter Event-Loops und schließt sie im aktuellen Loop.
+    """
+    for stale_loop, stale_session in list(_sessions.items()):
+        if stale_loop.is_closed():
+            del _sessions[stale_loop]
+            if not stale_session.closed:
+                task = loop.create_task(stale_session.close())
+                _closing.add(task)
+                task.add_done_callback(_closing.discard)
+
+
+async def close_shared_session() -> None:
+    """
+    Schließt alle geteilten Sessions samt Connection-Pools.
+
+    Sessions eines in einem anderen Thread laufenden Loops werden in diesem Loop geschlossen.
+    """
+    current_loop = asyncio.get_running_loop()
+    sessions = list(_sessions.items())
+    _sessions.clear()
+    for loop, session in sessions:
+        if session.closed:
+            continue
+        if loop is not current_loop and loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            await session.close()
+    pending = [task for task in _closing if task.get_loop() is current_loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+@asynccontextmanager
+async def request_with_retry(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: Any,
+    retries: int = 5,
+    backoff: float = 0.1,
+    **kwargs
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    Führt eine Anfrage aus und wiederholt sie bei Rate-Limits und Serverfehlern.
+
+    Zwischen den Versuchen wird exponentiell gewartet, mindestens aber so lange
+    wie der Retry-After-Header verlangt. Nach dem letzten Versuch wird die
+    Antwort unabhängig vom Status zurückgegeben.
+
+    Args:
+        session: aiohttp-Session
+        method: HTTP-Methode
+        url: Ziel-URL
+        retries: Maximale Anzahl an Versuchen
+        backoff: Basis-Wartezeit in Sekunden
+        **kwargs: Weitere Argumente für session.request
+
+    Returns:
+        Kontextmanager mit der Antwort
+    """
+    for attempt in range(retries):
+        response = await session.request(method, url, **kwargs)
+        if response.status not in RETRY_STATUSES or attempt == retries - 1:
+            break
+        delay = min(max(_retry_after(response), backoff * 2 ** attempt), MAX_RETRY_DELAY)
+        response.release()
+        await asyncio.sleep(delay)
+
+    try:
+        yield response
+    finally:
+        response.release()
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> float:
+    """
+    Liest den Retry-After-Header in Sekunden (0.0, falls nicht vorhanden oder kein Zahlenwert).
+    """
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0
@@ -1,19 +1,54 @@
+import atexit
 import logging
 import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from typing import Optional
 
 
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter, der den strftime-Teil von asctime nur einmal pro Sekunde berechnet.
+    """
+
+    def __init__(self, fmt: str):
+        super().__init__(fmt)
+        self._time_cache = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            prefix = time.strftime(self.default_time_format, self.converter(record.created))
+            self._time_cache = (second, prefix)
+        return self.default_msec_format % (prefix, record.msecs)
+
+
 class BotLogger:
     """
     Zentralisiertes Logging-System für den Trading-Bot.
     Unterstützt tagesbasierte Logs und Trade-spezifisches Logging.
+    Zusätzliche Argumente werden wie beim logging-Modul erst bei Ausgabe
+    per %-Formatierung eingesetzt. Datei- und Konsolenausgabe laufen in einem
+    Hintergrund-Thread, Aufrufer stellen Meldungen nur in eine Queue.
     """
 
+    # Ein Formatter für alle Handler; wird nur im Listener-Thread benutzt
+    _FORMATTER = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Listener des "TradingBot"-Loggers, geteilt von allen Instanzen
+    _listener: Optional[QueueListener] = None
+
     def __init__(self, log_dir: str = "logs", log_level: int = logging.INFO):
         """
         Initialisiert den Logger.
 
+        Weitere Instanzen nutzen die Handler der ersten Instanz mit, statt
+        eigene anzuhängen und jede Meldung mehrfach zu schreiben.
+
         Args:
             log_dir: Verzeichnis für Log-Dateien.
             log_level: Logging Level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
@@ -21,33 +56,63 @@ class BotLogger:
         self.log_dir = log_dir
         self.logger = logging.getLogger("TradingBot")
         self.logger.setLevel(log_level)
+        # Nicht zusätzlich an den Root-Logger weiterreichen
+        self.logger.propagate = False
+
+        if self.logger.handlers:
+            return
 
         # Verzeichnis für Logs erstellen, falls nicht vorhanden
         os.makedirs(self.log_dir, exist_ok=True)
 
-        # Handlers hinzufügen
-        self._setup_file_handler()
-        self._setup_console_handler()
+        # Handlers hinzufügen: Aufrufer schreiben nur in die Queue, der Listener-Thread übernimmt die I/O
+        log_queue: queue.Queue = queue.Queue(-1)
+        self.logger.addHandler(QueueHandler(log_queue))
+        BotLogger._listener = QueueListener(
+            log_queue,
+            self._setup_file_handler(),
+            self._setup_console_handler(),
+            respect_handler_level=True
+        )
+        BotLogger._listener.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """
+        Stoppt den Listener-Thread, nachdem alle ausstehenden Meldungen geschrieben wurden.
 
-    def _setup_file_handler(self) -> None:
+        Danach richtet die nächste BotLogger-Instanz die Handler neu ein.
+        """
+        listener = BotLogger._listener
+        if listener is None:
+            return
+        BotLogger._listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, QueueHandler):
+                self.logger.removeHandler(handler)
+
+    def _setup_file_handler(self) -> logging.Handler:
         """Konfiguriert den Datei-Handler mit Tages-Log-Dateien."""
         date_str = datetime.now().strftime('%Y-%m-%d')
         file_path = os.path.join(self.log_dir, f"trading_bot_{date_str}.log")
         file_handler = logging.FileHandler(file_path, encoding="utf-8")
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(self._get_formatter())
-        self.logger.addHandler(file_handler)
+        return file_handler
 
-    def _setup_console_handler(self) -> None:
+    def _setup_console_handler(self) -> logging.Handler:
         """Konfiguriert den Console-Handler."""
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(self._get_formatter())
-        self.logger.addHandler(console_handler)
+        return console_handler
 
     def _get_formatter(self) -> logging.Formatter:
-        """Erstellt ein einheitliches Log-Format."""
-        return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        """Liefert den gemeinsamen Formatter mit einheitlichem Log-Format."""
+        return self._FORMATTER
 
     def trade_log(self, action: str, token: str, amount: float, price: Optional[float] = None) -> None:
         """
@@ -59,29 +124,35 @@ class BotLogger:
             amount: Handelsmenge.
             price: Optional - Preis des Trades.
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         price_info = f" at {price:.6f} USDC" if price else ""
-        self.logger.info(f"TRADE - {action.upper()}: {amount} {token}{price_info}")
+        self.logger.info("TRADE - %s: %s %s%s", action.upper(), amount, token, price_info)
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Prüft, ob Meldungen des Levels ausgegeben werden (z.B. vor teurer Argument-Aufbereitung)."""
+        return self.logger.isEnabledFor(level)
 
-    def debug(self, message: str) -> None:
+    def debug(self, message: str, *args) -> None:
         """Debug-Level Log."""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
 
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args) -> None:
         """Info-Level Log."""
-        self.logger.info(message)
+        self.logger.info(message, *args)
 
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args) -> None:
         """Warning-Level Log."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
 
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args) -> None:
         """Error-Level Log."""
-        self.logger.error(message)
+        self.logger.error(message, *args)
 
-    def critical(self, message: str) -> None:
+    def critical(self, message: str, *args) -> None:
         """Critical-Level Log."""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
 
-    def exception(self, message: str) -> None:
+    def exception(self, message: str, *args) -> None:
         """Exception-Level Log mit Stacktrace."""
-        self.logger.exception(message)
+        self.logger.exception(message, *args)
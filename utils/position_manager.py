@@ -1,6 +1,10 @@
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-import json
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any, Set, Tuple
+import asyncio
+import os
+import secrets
+import threading
+import orjson
 from utils.logger import BotLogger
 from utils.helpers import Helpers
 
@@ -10,18 +14,50 @@ class PositionManager:
     Verwaltet Trading-Positionen mit Persistenz und dynamischen Updates.
     """
 
-    def __init__(self, logger: BotLogger, positions_file: str = "data/positions.json"):
+    def __init__(self, logger: BotLogger, positions_file: str = "data/positions.json",
+                 closed_positions_file: str = "data/closed_positions.jsonl", pretty: bool = False):
         """
         Initialisiert den Position Manager.
 
         Args:
             logger: Logger-Instanz
             positions_file: JSON-Datei für offene Positionen
+            closed_positions_file: JSON-Lines-Datei, an die geschlossene Positionen angehängt werden
+            pretty: positions.json eingerückt statt kompakt schreiben (zur manuellen Kontrolle)
         """
         self.logger = logger
         self.helpers = Helpers()
         self.positions_file = positions_file
+        self.closed_positions_file = closed_positions_file
+        self._dump_option = orjson.OPT_INDENT_2 if pretty else 0
+        # Innerhalb von buffered() werden Änderungen nur markiert und am Ende einmal gespeichert
+        self._dirty = False
+        self._buffer_depth = 0
+        # Laufende Nummer je Serialisierung; verhindert, dass ein verspäteter Schreib-Thread
+        # einen neueren Stand überschreibt
+        self._save_seq = 0
+        self._written_seq = 0
+        self._write_lock = threading.Lock()
         self.active_positions: Dict[str, Any] = self._load_positions()
+        # IDs bereits in der Historie stehender Positionen, damit keine Position doppelt angehängt wird
+        self._closed_ids: Set[str] = self._load_closed_ids()
+        # Geschlossene Positionen aus älteren Dateien einmalig in die Historie verschieben
+        closed = {
+            position_id: position for position_id, position in self.active_positions.items()
+            if position["status"] != "open"
+        }
+        if closed and self._append_closed_positions(closed):
+            for position_id in closed:
+                del self.active_positions[position_id]
+            # Sofort speichern, damit die migrierten Einträge nicht in positions.json verbleiben
+            self._dirty = True
+            self.flush()
+        # Stop-Loss/Take-Profit offener Positionen je Token als Tupel; fehlende Grenzen als ±inf,
+        # damit check_position_exits nur die Positionen des Tokens ohne None-Prüfungen durchläuft
+        self._exit_levels: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        for position_id, position in self.active_positions.items():
+            if position["status"] == "open":
+                self._set_exit_levels(position_id, position)
 
     def _load_positions(self) -> Dict[str, Any]:
         """
@@ -31,24 +67,179 @@ class PositionManager:
             Positionen als Dictionary
         """
         try:
-            with open(self.positions_file, "r") as file:
-                return json.load(file)
+            with open(self.positions_file, "rb") as file:
+                return orjson.loads(file.read())
         except FileNotFoundError:
-            self.logger.warning(f"{self.positions_file} nicht gefunden. Erstelle eine leere Datei.")
+            self.logger.warning("%s nicht gefunden. Erstelle eine leere Datei.", self.positions_file)
             return {}
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Fehler beim Laden von Positionen: {str(e)}")
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Fehler beim Laden von Positionen: %s", e)
             return {}
 
-    def _save_positions(self) -> None:
+    def _save_positions(self) -> bool:
+        """
+        Speichert Positionen atomar in die JSON-Datei.
+
+        Returns:
+            True bei Erfolg, False bei Schreibfehlern (z.B. voller Datenträger)
+        """
+        try:
+            self._write_positions(*self._serialize_positions())
+            return True
+        except OSError as e:
+            self.logger.error("Fehler beim Speichern der Positionen: %s", e)
+            return False
+
+    def _serialize_positions(self) -> Tuple[int, bytes]:
+        """
+        Serialisiert die Positionen und vergibt die nächste laufende Nummer.
+
+        Returns:
+            Tuple aus laufender Nummer und JSON-Bytes
+        """
+        self._save_seq += 1
+        return self._save_seq, orjson.dumps(self.active_positions, option=self._dump_option)
+
+    def _write_positions(self, seq: int, data: bytes) -> None:
+        """
+        Schreibt serialisierte Positionen atomar (threadsicher).
+
+        Die Daten werden in eine temporäre Datei geschrieben und per os.replace
+        übernommen, sodass ein Absturz nie eine halb geschriebene Datei hinterlässt.
+        Stände, die älter als der zuletzt geschriebene sind, werden verworfen.
+
+        Args:
+            seq: Laufende Nummer aus _serialize_positions
+            data: JSON-Bytes
+        """
+        with self._write_lock:
+            if seq < self._written_seq:
+                return
+            os.makedirs(os.path.dirname(self.positions_file) or ".", exist_ok=True)
+            tmp_file = f"{self.positions_file}.tmp"
+            with open(tmp_file, "wb") as file:
+                file.write(data)
+            os.replace(tmp_file, self.positions_file)
+            self._written_seq = seq
+
+    def _load_closed_ids(self) -> Set[str]:
         """
-        Speichert Positionen in die JSON-Datei.
+        Liest die IDs aller Positionen, die bereits in der Historie stehen.
+
+        Returns:
+            Menge der Position IDs
         """
+        closed_ids: Set[str] = set()
         try:
-            with open(self.positions_file, "w") as file:
-                json.dump(self.active_positions, file, indent=4)
-        except Exception as e:
-            self.logger.error(f"Fehler beim Speichern der Positionen: {str(e)}")
+            with open(self.closed_positions_file, "rb") as file:
+                for line in file:
+                    try:
+                        closed_ids.add(orjson.loads(line)["position_id"])
+                    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+                        self.logger.warning("Ungültige Zeile in der Positionshistorie: %s", e)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.error("Fehler beim Lesen der Positionshistorie: %s", e)
+        return closed_ids
+
+    def _append_closed_positions(self, positions: Dict[str, Any]) -> bool:
+        """
+        Hängt geschlossene Positionen als JSON-Zeilen an die Historie an.
+
+        Positionen, deren ID bereits in der Historie steht (z.B. nach einem Absturz
+        vor dem Speichern von positions.json), werden nicht erneut angehängt.
+
+        Args:
+            positions: Geschlossene Positionen nach Position ID
+
+        Returns:
+            True bei Erfolg, False bei Schreibfehlern
+        """
+        positions = {
+            position_id: position for position_id, position in positions.items()
+            if position_id not in self._closed_ids
+        }
+        if not positions:
+            return True
+        lines = b"".join(
+            orjson.dumps({"position_id": position_id, **position}) + b"\n"
+            for position_id, position in positions.items()
+        )
+        try:
+            os.makedirs(os.path.dirname(self.closed_positions_file) or ".", exist_ok=True)
+            with open(self.closed_positions_file, "ab") as file:
+                file.write(lines)
+            self._closed_ids.update(positions)
+            return True
+        except OSError as e:
+            self.logger.error("Fehler beim Speichern der Positionshistorie: %s", e)
+            return False
+
+    def _mark_dirty(self) -> None:
+        """
+        Merkt Änderungen vor und speichert sofort, sofern kein buffered()-Block aktiv ist.
+        """
+        self._dirty = True
+        if not self._buffer_depth:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Schreibt ausstehende Änderungen in die JSON-Datei.
+
+        Schlägt das Schreiben fehl, bleiben die Änderungen vorgemerkt und werden
+        beim nächsten Speichern erneut geschrieben.
+        """
+        if self._dirty and self._save_positions():
+            self._dirty = False
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """
+        Fasst mehrere Änderungen zu einem einzigen Schreibvorgang zusammen.
+
+        Beispiel:
+            with position_manager.buffered():
+                for position_id in exits:
+                    position_manager.close_position(position_id, price)
+        """
+        self._buffer_depth += 1
+        try:
+            yield
+        finally:
+            self._buffer_depth -= 1
+            if not self._buffer_depth:
+                self.flush()
+
+    async def flush_async(self) -> None:
+        """
+        Wie flush(), schreibt die Datei aber in einem Worker-Thread, ohne den Event-Loop zu blockieren.
+
+        Serialisiert wird im Event-Loop, damit parallele Änderungen keinen halben Stand erzeugen.
+        """
+        if not self._dirty:
+            return
+        seq, data = self._serialize_positions()
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write_positions, seq, data)
+        except OSError as e:
+            self._dirty = True
+            self.logger.error("Fehler beim Speichern der Positionen: %s", e)
+
+    @asynccontextmanager
+    async def buffered_async(self) -> AsyncIterator[None]:
+        """
+        Wie buffered(), der abschließende Schreibvorgang läuft aber über flush_async().
+        """
+        self._buffer_depth += 1
+        try:
+            yield
+        finally:
+            self._buffer_depth -= 1
+            if not self._buffer_depth:
+                await self.flush_async()
 
     def open_position(self, token: str, entry_price: float, amount: float,
                       stop_loss: Optional[float] = None, take_profit: Optional[float] = None) -> str:
@@ -65,7 +256,8 @@ class PositionManager:
         Returns:
             Position ID
         """
-        position_id = f"{token}_{datetime.now().timestamp()}"
+        position_id = f"{token}_{secrets.token_hex(8)}"
+        now = self.helpers.get_current_timestamp()
         position = {
             "token": token,
             "entry_price": entry_price,
@@ -73,14 +265,15 @@ class PositionManager:
             "stop_loss": stop_loss,
             "take_profit": take_profit,
             "status": "open",
-            "entry_time": self.helpers.get_current_timestamp(),
-            "last_update": self.helpers.get_current_timestamp(),
+            "entry_time": now,
+            "last_update": now,
             "realized_pnl": 0.0
         }
 
         self.active_positions[position_id] = position
-        self._save_positions()
-        self.logger.info(f"Neue Position eröffnet: {position_id}")
+        self._set_exit_levels(position_id, position)
+        self._mark_dirty()
+        self.logger.info("Neue Position eröffnet: %s", position_id)
         return position_id
 
     def close_position(self, position_id: str, exit_price: float) -> Optional[Dict[str, Any]]:
@@ -96,17 +289,30 @@ class PositionManager:
         """
         position = self.active_positions.get(position_id)
         if not position or position["status"] != "open":
-            self.logger.warning(f"Position nicht gefunden oder bereits geschlossen: {position_id}")
+            self.logger.warning("Position nicht gefunden oder bereits geschlossen: %s", position_id)
             return None
 
-        position["exit_price"] = exit_price
-        position["exit_time"] = self.helpers.get_current_timestamp()
-        position["status"] = "closed"
-        position["realized_pnl"] = self._calculate_pnl(position, exit_price)
+        closed_position = {
+            **position,
+            "exit_price": exit_price,
+            "exit_time": self.helpers.get_current_timestamp(),
+            "status": "closed",
+            "realized_pnl": self._calculate_pnl(position, exit_price)
+        }
+        # Geschlossene Positionen wandern in die Historie, positions.json enthält nur offene.
+        # Schlägt das Anhängen fehl, bleibt die Position unverändert offen.
+        if not self._append_closed_positions({position_id: closed_position}):
+            return None
+        del self.active_positions[position_id]
+        token_levels = self._exit_levels.get(position["token"])
+        if token_levels is not None:
+            token_levels.pop(position_id, None)
+            if not token_levels:
+                del self._exit_levels[position["token"]]
 
-        self._save_positions()
-        self.logger.info(f"Position geschlossen: {position_id} mit PnL: {position['realized_pnl']}")
-        return position
+        self._mark_dirty()
+        self.logger.info("Position geschlossen: %s mit PnL: %.2f", position_id, closed_position["realized_pnl"])
+        return closed_position
 
     def update_position(self, position_id: str, current_price: float,
                         stop_loss: Optional[float] = None, take_profit: Optional[float] = None) -> bool:
@@ -124,19 +330,40 @@ class PositionManager:
         """
         position = self.active_positions.get(position_id)
         if not position or position["status"] != "open":
-            self.logger.warning(f"Position nicht gefunden oder geschlossen: {position_id}")
+            self.logger.warning("Position nicht gefunden oder geschlossen: %s", position_id)
             return False
 
+        position["last_update"] = self.helpers.get_current_timestamp()
+
+        # Ohne geänderte Grenzen nur den Zeitstempel merken; er wird mit dem nächsten Speichern geschrieben
+        if (stop_loss is None or stop_loss == position["stop_loss"]) and \
+           (take_profit is None or take_profit == position["take_profit"]):
+            self._dirty = True
+            return True
+
         if stop_loss is not None:
             position["stop_loss"] = stop_loss
         if take_profit is not None:
             position["take_profit"] = take_profit
+        self._set_exit_levels(position_id, position)
 
-        position["last_update"] = self.helpers.get_current_timestamp()
-        self._save_positions()
-        self.logger.info(f"Position aktualisiert: {position_id}")
+        self._mark_dirty()
+        self.logger.info("Position aktualisiert: %s", position_id)
         return True
 
+    def _set_exit_levels(self, position_id: str, position: Dict[str, Any]) -> None:
+        """
+        Hinterlegt Stop Loss und Take Profit einer Position im Token-Index, fehlende Werte als -inf/inf.
+
+        Args:
+            position_id: Position ID
+            position: Positionsdetails
+        """
+        self._exit_levels.setdefault(position["token"], {})[position_id] = (
+            position["stop_loss"] or float("-inf"),
+            position["take_profit"] or float("inf")
+        )
+
     def _calculate_pnl(self, position: Dict[str, Any], current_price: float) -> float:
         """
         Berechnet den PnL einer Position.
@@ -146,10 +373,9 @@ class PositionManager:
             current_price: Aktueller Preis
 
         Returns:
-            Realisierter Gewinn/Verlust
+            Realisierter Gewinn/Verlust (ungerundet, gerundet wird erst bei der Ausgabe)
         """
-        entry_price = position["entry_price"]
-        return round((current_price - entry_price) * position["amount"], 2)
+        return (current_price - position["entry_price"]) * position["amount"]
 
     def get_active_positions(self) -> List[Dict[str, Any]]:
         """
@@ -158,29 +384,34 @@ class PositionManager:
         Returns:
             Liste offener Positionen
         """
+        # Geschlossene Einträge bleiben nur stehen, wenn sie nicht in die Historie geschrieben werden konnten
         return [pos for pos in self.active_positions.values() if pos["status"] == "open"]
 
     def clear_positions(self) -> None:
         """
-        Löscht alle Positionen.
+        Löscht alle offenen Positionen (die Historie geschlossener Positionen bleibt erhalten).
         """
         self.active_positions = {}
-        self._save_positions()
+        self._exit_levels = {}
+        self._mark_dirty()
         self.logger.info("Alle Positionen gelöscht.")
 
-    def check_position_exits(self, current_price: float) -> List[str]:
+    def check_position_exits(self, current_price: float, token: Optional[str] = None) -> List[str]:
         """
         Prüft ob Positionen geschlossen werden sollen.
         
         Args:
             current_price: Aktueller Token-Preis
+            token: Optional - nur Positionen dieses Tokens prüfen (ohne Angabe alle offenen)
             
         Returns:
             Liste von Position-IDs die geschlossen werden sollen
         """
-        exits = []
-        for pos_id, position in self.active_positions.items():
-            if (position["stop_loss"] and current_price <= position["stop_loss"]) or \
-               (position["take_profit"] and current_price >= position["take_profit"]):
-                exits.append(pos_id)
-        return exits
+        if token is not None:
+            token_levels = self._exit_levels.get(token, {}).items()
+        else:
+            token_levels = [item for levels in self._exit_levels.values() for item in levels.items()]
+        return [
+            pos_id for pos_id, (stop_loss, take_profit) in token_levels
+            if current_price <= stop_loss or current_price >= take_profit
+        ]